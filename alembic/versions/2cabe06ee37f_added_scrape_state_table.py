@@ -0,0 +1,33 @@
+"""Added scrape_state table
+
+Revision ID: 2cabe06ee37f
+Revises: c4cda637c67b
+Create Date: 2025-04-04 10:27:15.846213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2cabe06ee37f"
+down_revision: Union[str, None] = "c4cda637c67b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scrape_state",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("row_hashes", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scrape_state")
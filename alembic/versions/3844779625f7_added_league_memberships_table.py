@@ -0,0 +1,106 @@
+"""Added league_memberships table replacing the members and betting_leagues JSON
+
+Revision ID: 3844779625f7
+Revises: 3fb7d1ef4d2d
+Create Date: 2025-04-08 20:14:33.690125
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3844779625f7"
+down_revision: Union[str, None] = "3fb7d1ef4d2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "league_memberships",
+        sa.Column("league_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "joined_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("role", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["league_id"], ["betting_leagues.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("league_id", "user_id"),
+    )
+    op.create_index(
+        "ix_league_memberships_user_id_league_id",
+        "league_memberships",
+        ["user_id", "league_id"],
+        unique=False,
+    )
+
+    # Backfill from both JSON copies of the membership, then make sure every
+    # manager is a member with the manager role
+    op.execute(
+        """
+        INSERT INTO league_memberships (league_id, user_id, joined_at, role)
+        SELECT betting_leagues.id, users.id, betting_leagues.created_at, 'member'
+        FROM betting_leagues
+        CROSS JOIN json_array_elements(COALESCE(betting_leagues.members::json, '[]'::json)) AS member
+        JOIN users ON users.id = (member->>'id')::int
+        ON CONFLICT DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO league_memberships (league_id, user_id, joined_at, role)
+        SELECT betting_leagues.id, users.id, betting_leagues.created_at, 'member'
+        FROM users
+        CROSS JOIN json_array_elements_text(COALESCE(users.betting_leagues::json, '[]'::json)) AS league_id
+        JOIN betting_leagues ON betting_leagues.id = league_id::int
+        ON CONFLICT DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO league_memberships (league_id, user_id, joined_at, role)
+        SELECT id, manager_id, created_at, 'manager' FROM betting_leagues
+        ON CONFLICT (league_id, user_id) DO UPDATE SET role = 'manager'
+        """
+    )
+
+    op.drop_column("betting_leagues", "members")
+    op.drop_column("users", "betting_leagues")
+
+
+def downgrade() -> None:
+    op.add_column("users", sa.Column("betting_leagues", sa.JSON(), nullable=True))
+    op.add_column("betting_leagues", sa.Column("members", sa.JSON(), nullable=True))
+    op.execute(
+        """
+        UPDATE betting_leagues SET members = COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', users.id, 'username', users.username, 'points', users.points
+            ) ORDER BY league_memberships.joined_at)
+            FROM league_memberships JOIN users ON users.id = league_memberships.user_id
+            WHERE league_memberships.league_id = betting_leagues.id
+        ), '[]'::json)
+        """
+    )
+    op.execute(
+        """
+        UPDATE users SET betting_leagues = COALESCE((
+            SELECT json_agg(league_memberships.league_id ORDER BY league_memberships.joined_at)
+            FROM league_memberships
+            WHERE league_memberships.user_id = users.id
+        ), '[]'::json)
+        """
+    )
+    op.drop_index(
+        "ix_league_memberships_user_id_league_id", table_name="league_memberships"
+    )
+    op.drop_table("league_memberships")
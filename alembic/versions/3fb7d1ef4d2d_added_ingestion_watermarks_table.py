@@ -0,0 +1,32 @@
+"""Added ingestion_watermarks table
+
+Revision ID: 3fb7d1ef4d2d
+Revises: 4011ce173b54
+Create Date: 2025-04-06 11:41:09.377120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3fb7d1ef4d2d"
+down_revision: Union[str, None] = "4011ce173b54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_watermarks",
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("watermark", sa.Date(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("source"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingestion_watermarks")
@@ -0,0 +1,78 @@
+"""Added team ids to games and team_aliases table
+
+Revision ID: 4011ce173b54
+Revises: 2cabe06ee37f
+Create Date: 2025-04-05 16:03:52.117409
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4011ce173b54"
+down_revision: Union[str, None] = "2cabe06ee37f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Aliases are seeded from app/data/team_aliases.json on startup
+    op.create_table(
+        "team_aliases",
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("alias", sa.String(), nullable=False),
+        sa.Column("team_name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("source", "alias"),
+    )
+    op.add_column("games", sa.Column("team1_id", sa.Integer(), nullable=True))
+    op.add_column("games", sa.Column("team2_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "games_team1_id_fkey",
+        "games",
+        "teams",
+        ["team1_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_foreign_key(
+        "games_team2_id_fkey",
+        "games",
+        "teams",
+        ["team2_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+    # Backfill from the team names
+    op.execute(
+        "UPDATE games SET team1_id = teams.id FROM teams WHERE teams.name = games.team1"
+    )
+    op.execute(
+        "UPDATE games SET team2_id = teams.id FROM teams WHERE teams.name = games.team2"
+    )
+
+    op.create_index(
+        "ix_games_team1_id_match_time",
+        "games",
+        ["team1_id", "match_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_games_team2_id_match_time",
+        "games",
+        ["team2_id", "match_time"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_games_team2_id_match_time", table_name="games")
+    op.drop_index("ix_games_team1_id_match_time", table_name="games")
+    op.drop_constraint("games_team2_id_fkey", "games", type_="foreignkey")
+    op.drop_constraint("games_team1_id_fkey", "games", type_="foreignkey")
+    op.drop_column("games", "team2_id")
+    op.drop_column("games", "team1_id")
+    op.drop_table("team_aliases")
@@ -0,0 +1,99 @@
+"""Added member_count, last_activity_at and discovery indexes to betting_leagues
+
+Revision ID: 746a78879040
+Revises: c685cd4981b5
+Create Date: 2025-04-11 09:37:18.402176
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "746a78879040"
+down_revision: Union[str, None] = "c685cd4981b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "betting_leagues",
+        sa.Column("member_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "betting_leagues",
+        sa.Column(
+            "last_activity_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE betting_leagues SET
+            member_count = (
+                SELECT COUNT(*) FROM league_memberships
+                WHERE league_memberships.league_id = betting_leagues.id
+            ),
+            last_activity_at = GREATEST(
+                betting_leagues.created_at,
+                (
+                    SELECT MAX(joined_at) FROM league_memberships
+                    WHERE league_memberships.league_id = betting_leagues.id
+                ),
+                (
+                    -- Chat timestamps are naive UTC
+                    SELECT MAX(timestamp) AT TIME ZONE 'UTC' FROM league_chat_messages
+                    WHERE league_chat_messages.league_id = betting_leagues.id
+                )
+            )
+        """
+    )
+    op.create_index(
+        "ix_betting_leagues_public_member_count_id",
+        "betting_leagues",
+        [sa.text("member_count DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("public"),
+    )
+    op.create_index(
+        "ix_betting_leagues_public_last_activity_at_id",
+        "betting_leagues",
+        [sa.text("last_activity_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("public"),
+    )
+    op.create_index(
+        "ix_betting_leagues_name_trgm",
+        "betting_leagues",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_betting_leagues_description_trgm",
+        "betting_leagues",
+        ["description"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_betting_leagues_description_trgm", table_name="betting_leagues")
+    op.drop_index("ix_betting_leagues_name_trgm", table_name="betting_leagues")
+    op.drop_index(
+        "ix_betting_leagues_public_last_activity_at_id", table_name="betting_leagues"
+    )
+    op.drop_index(
+        "ix_betting_leagues_public_member_count_id", table_name="betting_leagues"
+    )
+    op.drop_column("betting_leagues", "last_activity_at")
+    op.drop_column("betting_leagues", "member_count")
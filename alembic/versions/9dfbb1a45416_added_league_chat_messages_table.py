@@ -0,0 +1,81 @@
+"""Added league_chat_messages table replacing the chat_messages JSON
+
+Revision ID: 9dfbb1a45416
+Revises: 3844779625f7
+Create Date: 2025-04-09 13:52:07.204816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9dfbb1a45416"
+down_revision: Union[str, None] = "3844779625f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "league_chat_messages",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("league_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("content", sa.String(length=255), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["league_id"], ["betting_leagues.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_league_chat_messages_league_id_id",
+        "league_chat_messages",
+        ["league_id", "id"],
+        unique=False,
+    )
+
+    # Backfill in each league's array order, so ids keep the conversation order
+    op.execute(
+        """
+        INSERT INTO league_chat_messages (league_id, user_id, username, content, timestamp)
+        SELECT betting_leagues.id, users.id,
+               COALESCE(message->>'username', users.username),
+               LEFT(COALESCE(message->>'content', ''), 255),
+               COALESCE((message->>'timestamp')::timestamp, betting_leagues.created_at)
+        FROM betting_leagues
+        CROSS JOIN LATERAL json_array_elements(
+            COALESCE(betting_leagues.chat_messages::json, '[]'::json)
+        ) WITH ORDINALITY AS messages(message, position)
+        JOIN users ON users.id = (message->>'user_id')::int
+        ORDER BY betting_leagues.id, position
+        """
+    )
+    op.drop_column("betting_leagues", "chat_messages")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "betting_leagues", sa.Column("chat_messages", sa.JSON(), nullable=True)
+    )
+    op.execute(
+        """
+        UPDATE betting_leagues SET chat_messages = COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', id, 'user_id', user_id, 'username', username,
+                'content', content, 'timestamp', timestamp
+            ) ORDER BY id)
+            FROM league_chat_messages
+            WHERE league_chat_messages.league_id = betting_leagues.id
+        ), '[]'::json)
+        """
+    )
+    op.drop_index(
+        "ix_league_chat_messages_league_id_id", table_name="league_chat_messages"
+    )
+    op.drop_table("league_chat_messages")
@@ -0,0 +1,37 @@
+"""Added odds_snapshots table partitioned by month
+
+Revision ID: c4cda637c67b
+Revises: 23f76a990237
+Create Date: 2025-04-02 18:12:40.512334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4cda637c67b"
+down_revision: Union[str, None] = "23f76a990237"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Monthly partitions are created on demand by app.services.odds_history
+    op.create_table(
+        "odds_snapshots",
+        sa.Column("game_id", sa.Integer(), nullable=False),
+        sa.Column("ts", sa.DateTime(), nullable=False),
+        sa.Column("team1_odds", sa.SmallInteger(), nullable=True),
+        sa.Column("team2_odds", sa.SmallInteger(), nullable=True),
+        sa.Column("draw_odds", sa.SmallInteger(), nullable=True),
+        sa.ForeignKeyConstraint(["game_id"], ["games.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("game_id", "ts"),
+        postgresql_partition_by="RANGE (ts)",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("odds_snapshots")
@@ -0,0 +1,31 @@
+"""Added an index on users.points for the leaderboard
+
+Revision ID: c685cd4981b5
+Revises: 9dfbb1a45416
+Create Date: 2025-04-10 10:21:44.613092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c685cd4981b5"
+down_revision: Union[str, None] = "9dfbb1a45416"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_users_points_id",
+        "users",
+        [sa.text("points DESC"), "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_points_id", table_name="users")
@@ -30,93 +30,37 @@ class Settings(BaseSettings):
         "-Champions-League",
     )
 
-    TEAM_NAME_MAPPING: ClassVar[dict[str, str]] = {
-        "Dortmundde": "Borussia Dortmund",
-        "deDortmund": "Borussia Dortmund",
-        "Sporting CPpt": "Sporting Lisbon",
-        "ptSporting CP": "Sporting Lisbon",
-        "Manchester Cityeng": "Manchester City",
-        "engManchester City": "Manchester City",
-        "Real Madrides": "Real Madrid",
-        "esReal Madrid": "Real Madrid",
-        "esBarcelona": "Barcelona",
-        "Barcelonaes": "Barcelona",
-        "Paris S-Gfr": "Paris Saint Germain",
-        "frParis S-G": "Paris Saint Germain",
-        "Atalantait": "Atalanta",
-        "itAtalanta": "Atalanta",
-        "Juventusit": "Juventus",
-        "itJuventus": "Juventus",
-        "Bayern Munichde": "Bayern München",
-        "deBayern Munich": "Bayern München",
-        "engLiverpool": "Liverpool",
-        "Liverpooleng": "Liverpool",
-        "engArsenal": "Arsenal",
-        "Arsenaleng": "Arsenal",
-        "Milanit": "AC Milan",
-        "itMilan": "AC Milan",
-        "Atletico Madrides": "Atletico Madrid",
-        "esAtletico Madrid": "Atletico Madrid",
-        "esAtlético Madrid": "Atletico Madrid",
-        "Atlético Madrides": "Atletico Madrid",
-        "Benficapt": "Benfica",
-        "ptBenfica": "Benfica",
-        "Portopt": "Porto",
-        "ptPorto": "Porto",
-        "deStuttgart": "Stuttgart",
-        "Stuttgartde": "Stuttgart",
-        "Feyenoordnl": "Feyenoord",
-        "nlFeyenoord": "Feyenoord",
-        "RB Leipzigde": "RB Leipzig",
-        "deRB Leipzig": "RB Leipzig",
-        "nlPSV Eindhoven": "PSV Eindhoven",
-        "PSV Eindhovennl": "PSV Eindhoven",
-        "Bolognait": "Bologna",
-        "itBologna": "Bologna",
-        "Sparta Praguecz": "Sparta Prague",
-        "czSparta Prague": "Sparta Prague",
-        "Celticsct": "Celtic",
-        "sctCeltic": "Celtic",
-        "frLille": "Lille",
-        "Lillefr": "Lille",
-        "itInter": "Inter",
-        "Interit": "Inter",
-        "Young Boysch": "Young Boys",
-        "chYoung Boys": "Young Boys",
-        "engAston Villa": "Aston Villa",
-        "Aston Villaeng": "Aston Villa",
-        "Monacofr": "Monaco",
-        "frMonaco": "Monaco",
-        "hrDinamo Zagreb": "Dinamo Zagreb",
-        "Dinamo Zagrebhr": "Dinamo Zagreb",
-        "atRB Salzburg": "RB Salzburg",
-        "RB Salzburgat": "RB Salzburg",
-        "skSlovan Bratislava": "Slovan Bratislava",
-        "Slovan Bratislavask": "Slovan Bratislava",
-        "uaShakhtar": "Shakhtar Donetsk",
-        "Shakhtarua": "Shakhtar Donetsk",
-        "esGirona": "Girona",
-        "Gironaes": "Girona",
-        "Club Bruggebe": "Club Brugge",
-        "beClub Brugge": "Club Brugge",
-        "deLeverkusen": "Bayren Leverkusen",
-        "Leverkusende": "Bayren Leverkusen",
-        "Red Starrs": "Red Star",
-        "rsRed Star": "Red Star",
-        "atSturm Graz": "Strum Graz",
-        "Sturm Grazat": "Strum Graz",
-        "frBrest": "Brest",
-        "Brestfr": "Brest",
-    }
-    API_TEAM_MAPPING: ClassVar[dict[str, str]] = {
-        "Bayern Munich": "Bayern München",
-        "Sporting CP": "Sporting Lisbon",
-        "VfB Stuttgart": "Stuttgart",
-        "RasenBallsport Leipzig": "RB Leipzig",
-        "FK Crvena Zvezda": "Red Star",
-        "Salzburg": "RB Salzburg",
-        "Bayer Leverkusen": "Bayren Leverkusen",
-    }
+    # FBRef allows about 10 requests per minute per client
+    CRAWLER_MAX_CONCURRENCY: int = int(os.getenv("CRAWLER_MAX_CONCURRENCY", 4))
+    CRAWLER_REQUESTS_PER_MINUTE: float = float(
+        os.getenv("CRAWLER_REQUESTS_PER_MINUTE", 10)
+    )
+    CRAWLER_BURST: int = int(os.getenv("CRAWLER_BURST", 1))
+    CRAWLER_MAX_RETRIES: int = int(os.getenv("CRAWLER_MAX_RETRIES", 5))
+    CRAWLER_TIMEOUT: float = float(os.getenv("CRAWLER_TIMEOUT", 10))
+
+    HTTP_CACHE_DIR: str = os.getenv("HTTP_CACHE_DIR", ".cache/http")
+    HTTP_CACHE_ENABLED: bool = os.getenv("HTTP_CACHE_ENABLED", True)
+
+    # "auto" picks the fastest installed of selectolax, lxml and html.parser
+    HTML_PARSER_BACKEND: str = os.getenv("HTML_PARSER_BACKEND", "auto")
+
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", 10))
+    HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", 5))
+    HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", 10))
+    # Consecutive failures before a host's circuit opens, and how long it stays open
+    HTTP_CIRCUIT_FAILURE_THRESHOLD: int = int(
+        os.getenv("HTTP_CIRCUIT_FAILURE_THRESHOLD", 5)
+    )
+    HTTP_CIRCUIT_RESET_SECONDS: float = float(
+        os.getenv("HTTP_CIRCUIT_RESET_SECONDS", 60)
+    )
+
+    # "off", "record" (save responses to the corpus) or "replay" (serve from it)
+    HTTP_REPLAY_MODE: str = os.getenv("HTTP_REPLAY_MODE", "off")
+    HTTP_REPLAY_DIR: str = os.getenv("HTTP_REPLAY_DIR", "benchmarks/corpus")
+    HTTP_REPLAY_LATENCY_MS: int = int(os.getenv("HTTP_REPLAY_LATENCY_MS", 0))
+
     STAGE_TO_GAMEDAY_BUDGET_KEY_MAPPING: ClassVar[dict[str, int]] = {
         "League phase": 2,
         "Knockout phase play-offs": 3,
@@ -125,12 +69,25 @@ class Settings(BaseSettings):
         "Semi-finals": 8,
         "Final": 10,
     }
-    LOGO_BASE_PATH: str = (
-        "/Users/yonatansugarmen/Desktop/Projects/Apps/BetManager/static/team_logos/"
-    )
+    LOGO_SOURCE_DIR: str = os.getenv("LOGO_SOURCE_DIR", "static/team_logos")
+    LOGO_BUILD_DIR: str = os.getenv("LOGO_BUILD_DIR", "static/build/team_logos")
+    LOGO_URL_PREFIX: str = os.getenv("LOGO_URL_PREFIX", "/assets/logos/")
+    LOGO_SIZES: ClassVar[list[int]] = [64, 128, 256]
+    LOGO_DEFAULT_SIZE: int = 128
+    # Team names whose logo file isn't simply the name with "_" for spaces
+    TEAM_LOGO_FILES: ClassVar[dict[str, str]] = {
+        "Borussia Dortmund": "Dortmund",
+        "Sporting Lisbon": "Sporting",
+        "Paris Saint Germain": "Paris_Saint-Germain",
+        "Bayern München": "Bayern_Munich",
+        "Bayren Leverkusen": "Bayer_Leverkusen",
+        "Strum Graz": "Sturm_Graz",
+        "RB Leipzig": "RB Leipzig",
+    }
     GAME_STANDART_LENGTH: int = 3
-    BETTING_ODDS_API_URL: str = (
-        "https://api.the-odds-api.com/v4/sports/soccer_uefa_champs_league/odds/"
+    BETTING_ODDS_API_URL: str = os.getenv(
+        "BETTING_ODDS_API_URL",
+        "https://api.the-odds-api.com/v4/sports/soccer_uefa_champs_league/odds/",
     )
     BETTING_ODDS_API_KEY: str = os.getenv(
         "BETTING_ODDS_API_KEY", "924657fcf70ca731200be32d4656b10a"
@@ -144,6 +101,12 @@ class Settings(BaseSettings):
         "LIVE_SCORES_API_SECRET", "Ufo4QAKf0kT2CWRxWDgh5QlutIzDK92F"
     )
     LIVE_SCORES_CL_COMP_ID: str = os.getenv("LIVE_SCORES_CL_COMP_ID", "244")
+    # History ingestion starts here until a watermark exists, then re-reads
+    # a few days before the watermark to pick up late corrections
+    LIVE_SCORES_SEASON_START: str = os.getenv("LIVE_SCORES_SEASON_START", "2024-09-01")
+    LIVE_SCORES_HISTORY_OVERLAP_DAYS: int = int(
+        os.getenv("LIVE_SCORES_HISTORY_OVERLAP_DAYS", 2)
+    )
     LIVE_SCORES_API_HISTORY_ENDPOINT: str = os.getenv(
         "LIVE_SCORES_API_HISTORY_ENDPOINT",
         "https://livescore-api.com/api-client/scores/history.json",
@@ -152,6 +115,33 @@ class Settings(BaseSettings):
         "LIVE_SCORES_API_FIXTURES_ENDPOINT",
         "https://livescore-api.com/api-client/fixtures/list.json",
     )
+    LIVE_SCORES_API_MAX_CONCURRENCY: int = int(
+        os.getenv("LIVE_SCORES_API_MAX_CONCURRENCY", 4)
+    )
+    CHAT_PAGE_SIZE: int = int(os.getenv("CHAT_PAGE_SIZE", 50))
+    CHAT_MAX_PAGE_SIZE: int = int(os.getenv("CHAT_MAX_PAGE_SIZE", 200))
+    # "memory" (single worker) or "postgres" (LISTEN/NOTIFY between workers)
+    CHAT_BROKER: str = os.getenv("CHAT_BROKER", "memory")
+    CHAT_STREAM_QUEUE_SIZE: int = int(os.getenv("CHAT_STREAM_QUEUE_SIZE", 100))
+    CHAT_STREAM_KEEPALIVE_SECONDS: int = int(
+        os.getenv("CHAT_STREAM_KEEPALIVE_SECONDS", 30)
+    )
+    LEADERBOARD_PAGE_SIZE: int = int(os.getenv("LEADERBOARD_PAGE_SIZE", 100))
+    LEADERBOARD_MAX_PAGE_SIZE: int = int(os.getenv("LEADERBOARD_MAX_PAGE_SIZE", 500))
+    # Bounds how long another worker can serve a leaderboard after a change
+    LEADERBOARD_CACHE_SECONDS: int = int(os.getenv("LEADERBOARD_CACHE_SECONDS", 60))
+    DISCOVERY_PAGE_SIZE: int = int(os.getenv("DISCOVERY_PAGE_SIZE", 20))
+    DISCOVERY_MAX_PAGE_SIZE: int = int(os.getenv("DISCOVERY_MAX_PAGE_SIZE", 100))
+    # bcrypt cost; stored hashes with another cost are rehashed on login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)
+    )
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+    LIVE_STREAM_QUEUE_SIZE: int = int(os.getenv("LIVE_STREAM_QUEUE_SIZE", 100))
+    LIVE_STREAM_KEEPALIVE_SECONDS: int = int(
+        os.getenv("LIVE_STREAM_KEEPALIVE_SECONDS", 15)
+    )
 
 
 settings = Settings()
@@ -4,7 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import inspect
 from sqlalchemy.orm import Session, registry
-from app.routers import user, game, bet, betting_league, team, side_bet
+from app.routers import user, game, bet, betting_league, team, side_bet, metrics
 from app.models import Base
 from app.models.user import User
 from app.models.game import Game
@@ -17,18 +17,22 @@ from app.schemas.bet import BetState
 from app.utils.logger import get_logger
 from app.utils.database import get_db, engine
 from app.utils.scraper import (
-    fetch_games_from_web,
-    update_scores_from_web,
+    sync_schedule_from_web,
     fetch_betting_odds,
     fetch_teams_from_web,
     fetch_players_from_web,
 )
 from app.services.side_bet_creation import create_side_bets
+from app.services.team_aliases import seed_team_aliases
+from app.services.league_chat import chat_broker
+from app.services.leaderboards import global_leaderboard
 from app.services.side_bets_helper import (
     update_side_bets_answers,
     update_users_side_bets_rewards,
 )
 from app.utils.api_helper import fecth_and_process_games_data
+from app.utils.logo_assets import ImmutableStaticFiles
+from app.utils.password_hashing import password_hasher
 from pathlib import Path
 import time
 import threading, os
@@ -103,8 +107,16 @@ app.include_router(bet.router, tags=["bets"])
 app.include_router(betting_league.router, tags=["betting_leagues"])
 app.include_router(team.router, tags=["teams"])
 app.include_router(side_bet.router, tags=["side_bets"])
+app.include_router(metrics.router, tags=["metrics"])
 
 
+# Content-hashed team logos, built by `python -m app.utils.logo_assets`
+app.mount(
+    settings.LOGO_URL_PREFIX.rstrip("/"),
+    ImmutableStaticFiles(directory=settings.LOGO_BUILD_DIR, check_dir=False),
+    name="team_logos",
+)
+
 # Serve React App
 frontend_build_dir = Path(__file__).parent.parent / "frontend" / "build"
 if frontend_build_dir.exists():
@@ -134,6 +146,7 @@ async def serve_react(full_path: str):
         "bets",
         "teams",
         "side-bets",
+        "metrics",
     ]  # ✅ Add all API prefixes
     if any(full_path.startswith(prefix) for prefix in api_prefixes):
         logger.warning(f"🚨 API path detected in React serve_react: {full_path}")
@@ -154,28 +167,8 @@ def fetch_and_store_games(db: Session, target_date: str = None):
         f"🔄 Fetching {'all games' if not target_date else f'games for {target_date}'} from web"
     )
 
-    games = fetch_games_from_web(db, target_date)
-    if not games:
-        logger.info("⚠️ No new games found")
-        return
-
-    added_games = 0
-    for game in games:
-        db_game = (
-            db.query(Game)
-            .filter(
-                Game.team1 == game.team1,
-                Game.team2 == game.team2,
-                Game.match_time == game.match_time,
-            )
-            .first()
-        )
-        if not db_game:
-            db.add(game)
-            added_games += 1
-
-    db.commit()
-    logger.info(f"✅ {added_games} new games added to the database")
+    # ✅ One download and parse adds new games and updates scores
+    sync_schedule_from_web(db, target_date)
 
     # Update betting odds
     fetch_betting_odds(db)
@@ -195,6 +188,7 @@ def scheduled_games_and_bets_updates(db: Session):
             update_users_side_bets_rewards(db)  # ✅ Update users side bets rewards
 
             db.commit()
+            global_leaderboard.rebuild(db)  # ✅ Pick up other workers' changes
         except Exception as e:
             logger.error(f"❌ Error in scheduled updates: {e}")
 
@@ -214,7 +208,9 @@ def init_db():
 def startup_tasks():
     logger.info("🚀 Running startup tasks")
     init_db()
+    chat_broker.start()  # ✅ Cross-worker chat delivery (no-op in memory mode)
     db = next(get_db())
+    seed_team_aliases(db)  # ✅ Load team name aliases before any ingestion
 
     fecth_and_process_games_data(db)
     update_game_states(db)  # ✅ Ensure all games have correct state
@@ -229,6 +225,7 @@ def startup_tasks():
 
     logger.info("✅ Startup tasks completed")
     db.commit()
+    global_leaderboard.rebuild(db)  # ✅ Load the global leaderboard
     db.close()
 
     # ✅ Start the scheduled updates in a separate thread
@@ -239,6 +236,11 @@ def startup_tasks():
     thread.start()
 
 
+@app.on_event("shutdown")
+def shutdown_tasks():
+    password_hasher.shutdown()  # ✅ Stop the password hashing workers
+
+
 def update_game_states(db: Session):
     logger.info("🔄 Updating game states")
 
@@ -7,9 +7,15 @@ from app.models.user import User
 from app.models.game import Game
 from app.models.bet import Bet
 from app.models.betting_league import BettingLeague
+from app.models.league_membership import LeagueMembership
+from app.models.league_chat_message import LeagueChatMessage
 from app.models.team import Team
+from app.models.team_alias import TeamAlias
 from app.models.player import Player
 from app.models.side_bet import SideBet, UsersSideBet
+from app.models.odds_snapshot import OddsSnapshot
+from app.models.scrape_state import ScrapeState
+from app.models.ingestion_watermark import IngestionWatermark
 from app.models.game import Game
 
 # ✅ Ensure metadata is created
@@ -23,8 +29,14 @@ __all__ = [
     "Game",
     "Bet",
     "BettingLeague",
+    "LeagueMembership",
+    "LeagueChatMessage",
     "Team",
+    "TeamAlias",
     "Player",
     "SideBet",
     "UsersSideBet",
+    "OddsSnapshot",
+    "ScrapeState",
+    "IngestionWatermark",
 ]
@@ -8,6 +8,9 @@ from sqlalchemy import (
     Boolean,
     func,
     Text,
+    DDL,
+    Index,
+    event,
 )
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.orm.attributes import flag_modified
@@ -21,7 +24,6 @@ class BettingLeague(Base):
     name = Column(String(50), nullable=False)
     description = Column(Text, nullable=True)
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    members = Column(JSON, default=[])  # ✅ List of user IDs
     posts = Column(JSON, default=[])
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -29,7 +31,40 @@ class BettingLeague(Base):
     public = Column(Boolean, default=False, nullable=False)
     code = Column(String(4), nullable=True, unique=True)  # ✅ 4-char league code
     group_picture = Column(String, nullable=True)  # ✅ URL to group picture
-    chat_messages = Column(JSON, default=list)  # ✅ List of chat messages
+    # ✅ Kept up to date by the membership service, for discovery sorting
+    member_count = Column(Integer, default=0, server_default="0", nullable=False)
+    last_activity_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        # Discovery pages, newest first among equal keys
+        Index(
+            "ix_betting_leagues_public_member_count_id",
+            member_count.desc(),
+            id.desc(),
+            postgresql_where=public,
+        ),
+        Index(
+            "ix_betting_leagues_public_last_activity_at_id",
+            last_activity_at.desc(),
+            id.desc(),
+            postgresql_where=public,
+        ),
+        # Substring search on name and description
+        Index(
+            "ix_betting_leagues_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_betting_leagues_description_trgm",
+            description,
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     def __repr__(self):
         return f"<BettingLeague(name='{self.name}', manager_id='{self.manager_id}', code='{self.code}')>"
@@ -46,3 +81,11 @@ class BettingLeague(Base):
             ):
                 self.code = league_code
                 break
+
+
+# The trigram indexes need the pg_trgm extension
+event.listen(
+    BettingLeague.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
@@ -1,5 +1,15 @@
 from sqlalchemy.orm import Session, relationship
-from sqlalchemy import Column, Integer, String, DateTime, and_, Float, Enum
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    and_,
+    Float,
+    Enum,
+    ForeignKey,
+    Index,
+)
 from app.config import settings
 from app.models import Base
 from app.schemas.game import GameState
@@ -8,10 +18,22 @@ from datetime import datetime, timedelta
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        # ✅ Per-team game lookups (home or away), newest first
+        Index("ix_games_team1_id_match_time", "team1_id", "match_time"),
+        Index("ix_games_team2_id_match_time", "team2_id", "match_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team1 = Column(String, nullable=False)
     team2 = Column(String, nullable=False)
+    # Null until the team exists in the teams table, see link_game_teams
+    team1_id = Column(
+        Integer, ForeignKey("teams.id", ondelete="SET NULL"), nullable=True
+    )
+    team2_id = Column(
+        Integer, ForeignKey("teams.id", ondelete="SET NULL"), nullable=True
+    )
     match_time = Column(DateTime, nullable=False)
     stadium = Column(String, nullable=True)
     game_state = Column(Enum(GameState), nullable=False, default=GameState.upcoming)
@@ -46,3 +68,26 @@ class Game(Base):
             self.game_state = GameState.ongoing
         else:
             self.game_state = GameState.history
+
+    def determine_game_winner(self):
+        """
+        Returns "1", "2" or "X" from the scores (penalties decide a draw),
+        or None if the game has no score yet.
+        """
+        if self.score_team1 is None or self.score_team2 is None:
+            return None
+        score_team1, score_team2 = self.score_team1, self.score_team2
+        if (
+            score_team1 == score_team2
+            and self.penalty_score_team1 is not None
+            and self.penalty_score_team2 is not None
+        ):
+            score_team1, score_team2 = (
+                self.penalty_score_team1,
+                self.penalty_score_team2,
+            )
+        if score_team1 > score_team2:
+            return "1"
+        if score_team2 > score_team1:
+            return "2"
+        return "X"
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Date, DateTime
+from app.models import Base
+from datetime import datetime
+
+
+class IngestionWatermark(Base):
+    """
+    Per-source high-water mark: the latest match date already finalized in our DB.
+    Incremental ingestion only asks its source for data after this point.
+    """
+
+    __tablename__ = "ingestion_watermarks"
+
+    source = Column(String, primary_key=True)
+    watermark = Column(Date, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return (
+            f"<IngestionWatermark(source='{self.source}', watermark={self.watermark})>"
+        )
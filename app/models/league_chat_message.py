@@ -0,0 +1,35 @@
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Index,
+)
+from app.models import Base
+from datetime import datetime
+
+
+class LeagueChatMessage(Base):
+    """
+    Append-only league chat. Ids only grow, so (league_id, id) serves
+    "latest N" and "before id X" pages.
+    """
+
+    __tablename__ = "league_chat_messages"
+    __table_args__ = (Index("ix_league_chat_messages_league_id_id", "league_id", "id"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    league_id = Column(
+        Integer, ForeignKey("betting_leagues.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    username = Column(String, nullable=False)
+    content = Column(String(255), nullable=False)
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<LeagueChatMessage(id={self.id}, league_id={self.league_id}, username='{self.username}')>"
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
+from app.models import Base
+
+
+class LeagueMembership(Base):
+    """
+    A user's membership in a betting league.
+    The primary key serves league -> members lookups, the user index the reverse.
+    """
+
+    __tablename__ = "league_memberships"
+    __table_args__ = (
+        Index("ix_league_memberships_user_id_league_id", "user_id", "league_id"),
+    )
+
+    ROLE_MANAGER = "manager"
+    ROLE_MEMBER = "member"
+
+    league_id = Column(
+        Integer, ForeignKey("betting_leagues.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    joined_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    role = Column(String(20), nullable=False, default=ROLE_MEMBER)
+
+    def __repr__(self):
+        return f"<LeagueMembership(league_id={self.league_id}, user_id={self.user_id}, role='{self.role}')>"
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, SmallInteger, DateTime, ForeignKey
+from app.models import Base
+from datetime import datetime
+
+
+class OddsSnapshot(Base):
+    """
+    Append-only history of a game's 1X2 odds, partitioned by month.
+    Odds are stored as smallints scaled by `ODDS_SCALE` (2.35 -> 235).
+    """
+
+    __tablename__ = "odds_snapshots"
+    __table_args__ = {"postgresql_partition_by": "RANGE (ts)"}
+
+    ODDS_SCALE = 100
+
+    game_id = Column(
+        Integer, ForeignKey("games.id", ondelete="CASCADE"), primary_key=True
+    )
+    ts = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    team1_odds = Column(SmallInteger, nullable=True)
+    team2_odds = Column(SmallInteger, nullable=True)
+    draw_odds = Column(SmallInteger, nullable=True)
+
+    def __repr__(self):
+        return f"<OddsSnapshot(game_id={self.game_id}, ts={self.ts}, 1={self.team1_odds}, X={self.draw_odds}, 2={self.team2_odds})>"
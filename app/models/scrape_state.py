@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, JSON, DateTime
+from app.models import Base
+from datetime import datetime
+
+
+class ScrapeState(Base):
+    """
+    Fingerprint of the last reconciled version of a scraped table.
+    `row_hashes` maps each row's key (e.g. a team or player name) to its hash,
+    `content_hash` covers the whole table.
+    """
+
+    __tablename__ = "scrape_state"
+
+    key = Column(String, primary_key=True)
+    content_hash = Column(String(64), nullable=False)
+    row_hashes = Column(JSON, nullable=False, default={})
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ScrapeState(key='{self.key}', content_hash='{self.content_hash}', rows={len(self.row_hashes or {})})>"
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String
+from app.models import Base
+
+
+class TeamAlias(Base):
+    """
+    Maps a team name as spelled by a source ("fbref", "api") to our canonical team name.
+    """
+
+    __tablename__ = "team_aliases"
+
+    source = Column(String, primary_key=True)
+    alias = Column(String, primary_key=True)
+    team_name = Column(String, nullable=False)
+
+    def __repr__(self):
+        return f"<TeamAlias({self.source}: '{self.alias}' -> '{self.team_name}')>"
@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, CheckConstraint, JSON
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    func,
+    CheckConstraint,
+    Index,
+    JSON,
+)
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 from app.models import Base
 from app.models.bet import Bet
-from app.models.betting_league import BettingLeague
 
 
 class User(Base):
@@ -23,7 +31,6 @@ class User(Base):
     )
     points = Column(Integer, default=0)
     gameday_budget = Column(JSON, nullable=False, default={})
-    betting_leagues = Column(JSON, default=[])
 
     # Relationships
     # bets = relationship("Bet", back_populates="user", cascade="all, delete-orphan")
@@ -33,6 +40,8 @@ class User(Base):
         CheckConstraint("username <> ''", name="username_not_empty"),
         CheckConstraint("LENGTH(username) >= 3", name="username_min_length"),
         CheckConstraint("email <> ''", name="email_not_empty"),
+        # Leaderboard order, read when the in-memory leaderboard is not loaded
+        Index("ix_users_points_id", points.desc(), id),
     )
 
     def __repr__(self):
@@ -65,15 +74,3 @@ class User(Base):
             db.add(bet)
             flag_modified(bet, "points_granted")
         db.commit()
-
-    def join_league(self, betting_league: BettingLeague, db: Session):
-        if betting_league.id not in self.betting_leagues:
-            self.betting_leagues.append(betting_league.id)  # Append league ID
-            flag_modified(self, "betting_leagues")  # Notify SQLAlchemy of the change
-            db.add(self)  # Ensure SQLAlchemy tracks the update
-
-    def leave_league(self, league_id: int, db: Session):
-        if league_id in self.betting_leagues:
-            self.betting_leagues.remove(league_id)  # Remove by value
-            flag_modified(self, "betting_leagues")
-            db.add(self)
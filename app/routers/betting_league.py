@@ -1,15 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    WebSocket,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
 from app.models.betting_league import BettingLeague
 from app.models.user import User
-from app.utils.database import get_db
+from app.models.league_membership import LeagueMembership
+from app.models.league_chat_message import LeagueChatMessage
+from app.config import settings
+from app.services.league_chat import (
+    chat_event,
+    hub_for,
+    publish_chat_event,
+    release_hub,
+)
+from app.services.league_discovery import discover_leagues
+from app.services.leaderboards import league_leaderboard, league_rank
+from app.services.league_memberships import (
+    add_member,
+    is_member,
+    league_members,
+    members_by_league,
+    record_league_activity,
+    remove_member,
+)
+from app.utils.database import get_db, session_local
 from app.utils.logger import get_logger
-from app.schemas.betting_league import BettingLeagueCreate, BettingLeagueResponse
-from app.schemas.user import UserResponse
+from app.schemas.betting_league import (
+    BettingLeagueCreate,
+    BettingLeagueResponse,
+    LeagueDiscoveryPage,
+    LeagueSummary,
+)
+from app.schemas.user import LeaderboardEntry, RankResponse
 from app.schemas.chat_message import ChatMessageCreate, ChatMessageResponse
 from datetime import datetime
-from typing import List
+from typing import List, Literal, Optional
 
 
 # Router setup
@@ -17,6 +49,22 @@ router = APIRouter(prefix="/betting-leagues")
 logger = get_logger("router.betting_league")
 
 
+def league_response(
+    league: BettingLeague, members: list[dict]
+) -> BettingLeagueResponse:
+    return BettingLeagueResponse(
+        id=league.id,
+        name=league.name,
+        description=league.description,
+        group_picture=league.group_picture,
+        manager_id=league.manager_id,
+        public=league.public,
+        members=members,
+        num_members=len(members),
+        code=league.code,
+    )
+
+
 @router.post("/", response_model=BettingLeagueResponse)
 def create_betting_league(
     betting_league_request: BettingLeagueCreate, db: Session = Depends(get_db)
@@ -32,15 +80,10 @@ def create_betting_league(
     if not manager:
         raise HTTPException(status_code=404, detail="Manager not found")
 
-    members = [
-        {"id": manager.id, "username": manager.username, "points": manager.points}
-    ]
-
     new_league = BettingLeague(
         name=betting_league_request.name,
         description=betting_league_request.description,
         manager_id=betting_league_request.manager_id,
-        members=members,
         created_at=datetime.utcnow(),
         public=betting_league_request.public,
         group_picture=betting_league_request.group_picture,  # ✅ Store picture URL
@@ -48,11 +91,13 @@ def create_betting_league(
 
     new_league.generate_code(db)
     db.add(new_league)
+    db.flush()
+    add_member(db, new_league.id, manager.id, role=LeagueMembership.ROLE_MANAGER)
     db.commit()
     db.refresh(new_league)
 
     logger.info(f"New betting league created: {new_league.name}")
-    return new_league
+    return league_response(new_league, league_members(db, new_league.id))
 
 
 @router.get("/", response_model=list[BettingLeagueResponse])
@@ -64,12 +109,8 @@ def get_all_betting_leagues(db: Session = Depends(get_db)):
     if not leagues:
         raise HTTPException(status_code=404, detail="No betting leagues found")
 
-    return [
-        BettingLeagueResponse(
-            id=league.id, name=league.name, members=league.members, code=league.code
-        )
-        for league in leagues
-    ]
+    members = members_by_league(db, [league.id for league in leagues])
+    return [league_response(league, members[league.id]) for league in leagues]
 
 
 @router.get("/public", response_model=list[BettingLeagueResponse])
@@ -82,19 +123,45 @@ def get_all_public_betting_leagues(db: Session = Depends(get_db)):
     if not leagues:
         raise HTTPException(status_code=404, detail="No public betting leagues found")
 
-    return [
-        BettingLeagueResponse(
-            id=league.id,
-            name=league.name,
-            description=league.description,
-            group_picture=league.group_picture,
-            manager_id=league.manager_id,
-            num_members=len(league.members),
-            members=league.members,
-            code=league.code,
-        )
-        for league in leagues
-    ]
+    members = members_by_league(db, [league.id for league in leagues])
+    return [league_response(league, members[league.id]) for league in leagues]
+
+
+@router.get("/discover", response_model=LeagueDiscoveryPage)
+def discover_public_leagues(
+    q: Optional[str] = Query(
+        None, min_length=2, max_length=50, description="Search name and description"
+    ),
+    sort: Literal["members", "activity"] = Query("members"),
+    limit: int = Query(
+        settings.DISCOVERY_PAGE_SIZE, ge=1, le=settings.DISCOVERY_MAX_PAGE_SIZE
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    db: Session = Depends(get_db),
+):
+    """
+    Browse public betting leagues, biggest or most recently active first.
+    """
+    try:
+        leagues, next_cursor = discover_leagues(db, q, sort, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return LeagueDiscoveryPage(
+        leagues=[
+            LeagueSummary(
+                id=league.id,
+                name=league.name,
+                description=league.description,
+                manager_id=league.manager_id,
+                group_picture=league.group_picture,
+                num_members=league.member_count,
+                last_activity_at=league.last_activity_at,
+            )
+            for league in leagues
+        ],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{league_id}", response_model=BettingLeagueResponse)
@@ -106,15 +173,7 @@ def get_betting_league(league_id: int, db: Session = Depends(get_db)):
     if not league:
         raise HTTPException(status_code=404, detail="Betting league not found")
 
-    return BettingLeagueResponse(
-        id=league.id,
-        name=league.name,
-        description=league.description,
-        manager_id=league.manager_id,
-        members=league.members,
-        num_members=len(league.members),
-        code=league.code,
-    )
+    return league_response(league, league_members(db, league.id))
 
 
 @router.get("/find-by-code/{league_code}", response_model=BettingLeagueResponse)
@@ -127,15 +186,7 @@ def get_league_by_code(league_code: str, db: Session = Depends(get_db)):
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    return BettingLeagueResponse(
-        id=league.id,
-        name=league.name,
-        description=league.description,
-        manager_id=league.manager_id,
-        members=league.members,
-        num_members=len(league.members),
-        code=league.code,
-    )
+    return league_response(league, league_members(db, league.id))
 
 
 @router.delete("/{league_id}")
@@ -172,7 +223,7 @@ def update_betting_league(
     db.commit()
     db.refresh(league)
 
-    return league
+    return league_response(league, league_members(db, league.id))
 
 
 @router.post("/{league_id}/join/{user_id}")
@@ -196,22 +247,11 @@ def join_betting_league(
         raise HTTPException(status_code=400, detail="Incorrect league code")
 
     # Ensure user is not already a member
-    if any(member["id"] == user_id for member in league.members):
+    if is_member(db, league_id, user_id):
         raise HTTPException(status_code=400, detail="User already in league")
 
-    # Update league members list
-    league.members.append(
-        {"id": user.id, "username": user.username, "points": user.points}
-    )
-    flag_modified(league, "members")
-    # Update user's betting leagues
-    user.join_league(league, db)  # ✅ Pass `db` to ensure update is tracked
-
-    # Explicitly add both objects to session
-    db.add(league)
-    db.add(user)
-
-    db.commit()  # ✅ Commit both changes at once
+    add_member(db, league_id, user_id)
+    db.commit()
 
     return {"message": f"User {user.username} joined league {league.name}"}
 
@@ -229,45 +269,65 @@ def leave_betting_league(league_id: int, user_id: int, db: Session = Depends(get
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    league.members = [member for member in league.members if member["id"] != user_id]
-
-    flag_modified(league, "members")
-    user.leave_league(league_id, db)
-    db.add(league)
-    db.add(user)
+    remove_member(db, league_id, user_id)
     db.commit()
 
     return {"message": f"User {user.username} left league {league.name}"}
 
 
-@router.get("/{league_id}/leaderboard", response_model=list[UserResponse])
-def get_league_leaderboard(league_id: int, db: Session = Depends(get_db)):
+@router.get("/{league_id}/leaderboard", response_model=list[LeaderboardEntry])
+def get_league_leaderboard(
+    league_id: int,
+    limit: int = Query(
+        settings.LEADERBOARD_PAGE_SIZE, ge=1, le=settings.LEADERBOARD_MAX_PAGE_SIZE
+    ),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
     """
-    Get the leaderboard for a specific betting league using the 'members' field.
+    Get a page of the leaderboard of a specific betting league, highest points
+    first. Tied users share a rank.
     """
-    # Fetch the league using the league_id
-    league = db.query(BettingLeague).filter(BettingLeague.id == league_id).first()
-
-    if not league:
+    if not db.query(BettingLeague.id).filter(BettingLeague.id == league_id).first():
         raise HTTPException(status_code=404, detail="League not found")
 
-    # Get the list of user IDs from the 'members' field (extracting 'id' from each member dictionary)
-    member_ids = [member["id"] for member in league.members]
+    return league_leaderboard(db, league_id, limit, offset)
 
-    # Fetch all users who are members of the league
-    users = db.query(User).filter(User.id.in_(member_ids)).all()
 
-    # Sort users by points in descending order
-    users = sorted(users, key=lambda user: user.points, reverse=True)
+@router.get("/{league_id}/rank/{user_id}", response_model=RankResponse)
+def get_league_rank(
+    league_id: int,
+    user_id: int,
+    neighbours: int = Query(1, ge=0, le=10),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a member's rank in a specific betting league, with the members just
+    above and below.
+    """
+    if not db.query(BettingLeague.id).filter(BettingLeague.id == league_id).first():
+        raise HTTPException(status_code=404, detail="League not found")
 
-    # Return a list of user objects with points and username
-    return [
-        UserResponse(id=user.id, username=user.username, points=user.points)
-        for user in users
-    ]
+    rank = league_rank(db, league_id, user_id, neighbours)
+    if rank is None:
+        raise HTTPException(
+            status_code=404, detail="User is not a member of the league"
+        )
+
+    return rank
 
 
 # Group chat routes
+def chat_message_response(message: LeagueChatMessage) -> ChatMessageResponse:
+    return ChatMessageResponse(
+        id=message.id,
+        user_id=message.user_id,
+        username=message.username,
+        content=message.content,
+        timestamp=message.timestamp,
+    )
+
+
 @router.post("/{league_id}/chat", response_model=ChatMessageResponse)
 def send_chat_message(
     league_id: int, message_request: ChatMessageCreate, db: Session = Depends(get_db)
@@ -280,51 +340,100 @@ def send_chat_message(
         raise HTTPException(status_code=404, detail="League not found")
 
     user = db.query(User).filter(User.id == message_request.user_id).first()
-    if not any(member["id"] == user.id for member in league.members):
+    if not user or not is_member(db, league_id, user.id):
         raise HTTPException(status_code=403, detail="User not a member of league")
-    if league.chat_messages is None:
-        league.chat_messages = []
-
-    new_message = {
-        "id": len(league.chat_messages) + 1,
-        "user_id": message_request.user_id,
-        "username": user.username,
-        "content": message_request.content,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
-    league.chat_messages.append(new_message)
-    flag_modified(league, "chat_messages")
-    db.commit()
-    db.refresh(league)
-    return ChatMessageResponse(
-        id=new_message["id"],
-        user_id=new_message["user_id"],
-        username=new_message["username"],
-        content=new_message["content"],
-        timestamp=new_message["timestamp"],
+
+    new_message = LeagueChatMessage(
+        league_id=league_id,
+        user_id=user.id,
+        username=user.username,
+        content=message_request.content,
+        timestamp=datetime.utcnow(),
     )
+    db.add(new_message)
+    record_league_activity(db, league_id)
+    db.commit()
+    db.refresh(new_message)
+    publish_chat_event(chat_event("message", new_message))
+    return chat_message_response(new_message)
+
+
+@router.websocket("/{league_id}/chat/ws")
+async def chat_socket(websocket: WebSocket, league_id: int, user_id: int):
+    """
+    Pushes the league's chat events ("message", "edit", "delete") as JSON as
+    soon as they are committed, with a {"type": "ping"} on idle connections.
+    Replaces polling GET /chat; history is still read from there.
+    """
+    with session_local() as db:
+        allowed = await run_in_threadpool(is_member, db, league_id, user_id)
+    if not allowed:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    hub = hub_for(league_id)
+
+    async def forward():
+        async for event in hub.listen(keepalive=settings.CHAT_STREAM_KEEPALIVE_SECONDS):
+            await websocket.send_json(event or {"type": "ping"})
+        # ✅ Dropped as a slow consumer, the client reconnects and reloads
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+    async def wait_for_disconnect():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    tasks = [asyncio.create_task(forward()), asyncio.create_task(wait_for_disconnect())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        release_hub(league_id)
 
 
 @router.get("/{league_id}/chat", response_model=list[ChatMessageResponse])
-def get_chat_messages(league_id: int, db: Session = Depends(get_db)):
+def get_chat_messages(
+    league_id: int,
+    limit: int = Query(settings.CHAT_PAGE_SIZE, ge=1, le=settings.CHAT_MAX_PAGE_SIZE),
+    before_id: Optional[int] = Query(
+        None, description="Only return messages older than this message id"
+    ),
+    db: Session = Depends(get_db),
+):
     """
-    Get the group chat messages for a specific betting league.
+    Get a page of the group chat of a specific betting league, oldest first:
+    the latest `limit` messages, or the `limit` messages before `before_id`.
     """
     league = db.query(BettingLeague).filter(BettingLeague.id == league_id).first()
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
-    if league.chat_messages is None:
-        return []
-    return [
-        ChatMessageResponse(
-            id=message["id"],
-            user_id=message["user_id"],
-            username=message["username"],
-            content=message["content"],
-            timestamp=message["timestamp"],
+
+    query = db.query(LeagueChatMessage).filter(LeagueChatMessage.league_id == league_id)
+    if before_id is not None:
+        query = query.filter(LeagueChatMessage.id < before_id)
+    messages = query.order_by(LeagueChatMessage.id.desc()).limit(limit).all()
+    return [chat_message_response(message) for message in reversed(messages)]
+
+
+def get_league_chat_message(
+    db: Session, league_id: int, message_id: int
+) -> LeagueChatMessage:
+    chat_message = (
+        db.query(LeagueChatMessage)
+        .filter(
+            LeagueChatMessage.league_id == league_id,
+            LeagueChatMessage.id == message_id,
         )
-        for message in league.chat_messages
-    ]
+        .first()
+    )
+    if not chat_message:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return chat_message
 
 
 @router.put("/{league_id}/chat/{message_id}", response_model=ChatMessageResponse)
@@ -337,20 +446,11 @@ def update_chat_message(
     """
     Update a specific chat message in the group chat of a specific betting league.
     """
-    league = db.query(BettingLeague).filter(BettingLeague.id == league_id).first()
-    if not league:
-        raise HTTPException(status_code=404, detail="League not found")
-
-    chat_message = next(
-        (msg for msg in league.chat_messages if msg["id"] == message_id), None
-    )
-    if not chat_message:
-        raise HTTPException(status_code=404, detail="Message not found")
-
-    chat_message["content"] = message_request.content
-    flag_modified(league, "chat_messages")
+    chat_message = get_league_chat_message(db, league_id, message_id)
+    chat_message.content = message_request.content
     db.commit()
-    return chat_message
+    publish_chat_event(chat_event("edit", chat_message))
+    return chat_message_response(chat_message)
 
 
 @router.delete("/{league_id}/chat/{message_id}")
@@ -358,17 +458,9 @@ def delete_chat_message(league_id: int, message_id: int, db: Session = Depends(g
     """
     Delete a specific chat message from the group chat of a specific betting league.
     """
-    league = db.query(BettingLeague).filter(BettingLeague.id == league_id).first()
-    if not league:
-        raise HTTPException(status_code=404, detail="League not found")
-
-    chat_message = next(
-        (msg for msg in league.chat_messages if msg["id"] == message_id), None
-    )
-    if not chat_message:
-        raise HTTPException(status_code=404, detail="Message not found")
-
-    league.chat_messages.remove(chat_message)
-    flag_modified(league, "chat_messages")
+    chat_message = get_league_chat_message(db, league_id, message_id)
+    event = chat_event("delete", chat_message)
+    db.delete(chat_message)
     db.commit()
+    publish_chat_event(event)
     return {"message": "Message deleted successfully"}
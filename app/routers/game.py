@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy import cast, Date, func
 from sqlalchemy.orm import Session
 from datetime import datetime
@@ -6,8 +7,10 @@ from typing import List
 
 from app.utils.database import get_db
 from app.models.game import Game
-from app.schemas.game import GameResponse
+from app.schemas.game import GameResponse, OddsPoint
 from app.utils.logger import get_logger
+from app.services.live_scores import live_score_events
+from app.services.odds_history import get_odds_series
 from app.utils.scraper import (
     fetch_games_from_web,
     update_scores_from_web,
@@ -28,6 +31,21 @@ def get_all_games(db: Session = Depends(get_db)):
     return games
 
 
+# 📌 **LIVE SCORES STREAM**
+@router.get("/live/stream")
+async def stream_live_scores():
+    """
+    Push score, state and winner changes as Server-Sent Events.
+    Replaces polling the games endpoints during matches.
+    """
+    logger.info("📡 New live scores subscriber")
+    return StreamingResponse(
+        live_score_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # 📌 **GET UPCOMING GAMES**
 @router.get("/upcoming/by-date/{date}", response_model=List[GameResponse])
 def get_upcoming_games_by_date(date: str, db: Session = Depends(get_db)):
@@ -58,6 +76,20 @@ def get_upcoming_games_by_date(date: str, db: Session = Depends(get_db)):
     return games
 
 
+# 📌 **ODDS HISTORY**
+@router.get("/{game_id}/odds-history", response_model=List[OddsPoint])
+def get_game_odds_history(
+    game_id: int,
+    points: int = Query(200, ge=2, le=2000, description="Max points to return"),
+    db: Session = Depends(get_db),
+):
+    """Retrieve a game's odds movement, downsampled for charting."""
+    logger.info(f"📈 Fetching odds history for game {game_id}")
+    if not db.query(Game.id).filter(Game.id == game_id).first():
+        raise HTTPException(status_code=404, detail="Game not found")
+    return get_odds_series(db, game_id, points)
+
+
 # 📌 **DELETE GAME BY ID**
 @router.delete("/{game_id}")
 def delete_game(game_id: int, db: Session = Depends(get_db)):
@@ -74,15 +106,7 @@ def delete_game(game_id: int, db: Session = Depends(get_db)):
 def import_all_games(db: Session = Depends(get_db)):
     """Fetch and store all upcoming Champions League matches."""
     logger.info("🔍 Importing all upcoming games")
-    games = fetch_games_from_web()
-    added_games = 0
-
-    for game in games:
-        if not Game.get_by_team_names(db, game.team1, game.team2):
-            db.add(game)
-            added_games += 1
-
-    db.commit()
+    added_games = fetch_games_from_web(db)
     return {"message": f"{added_games} new games imported successfully"}
 
 
@@ -91,15 +115,7 @@ def import_all_games(db: Session = Depends(get_db)):
 def import_games_by_date(target_date: str, db: Session = Depends(get_db)):
     """Fetch and store games for a specific date."""
     logger.info(f"📅 Importing games for {target_date}")
-    games = fetch_games_from_web(target_date)
-    added_games = 0
-
-    for game in games:
-        if not Game.get_by_team_names(db, game.team1, game.team2):
-            db.add(game)
-            added_games += 1
-
-    db.commit()
+    added_games = fetch_games_from_web(db, target_date)
     return {"message": f"{added_games} games imported for {target_date}"}
 
 
@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from app.utils.http_cache import http_cache
+from app.utils.http_client import circuit_breakers, http_metrics
+from app.utils.logger import get_logger
+from app.utils.password_hashing import password_hasher
+
+router = APIRouter(prefix="/metrics")
+logger = get_logger("router.metrics")
+
+
+@router.get("/http-cache", response_model=dict)
+def get_http_cache_metrics():
+    """
+    Hit and miss counters of the on-disk HTTP cache used by the scraper.
+    """
+    return http_cache.stats()
+
+
+@router.get("/http", response_model=dict)
+def get_http_metrics():
+    """
+    Per-host request counts, error counts and latency histograms of all
+    outbound HTTP calls, with the state of every host's circuit breaker.
+    """
+    return {"hosts": http_metrics.snapshot(), "circuits": circuit_breakers.states()}
+
+
+@router.get("/password-hashing", response_model=dict)
+def get_password_hashing_metrics():
+    """
+    Queue depth and job counters of the password hashing pool used by login
+    and registration.
+    """
+    return password_hasher.stats()
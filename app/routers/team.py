@@ -69,7 +69,7 @@ async def get_team_game_history(team_id: int, db: Session = Depends(get_db)):
     # ✅ Query all past games where the team played (either as team1 or team2)
     games_history = (
         db.query(Game)
-        .filter(or_(Game.team1 == team.name, Game.team2 == team.name))
+        .filter(or_(Game.team1_id == team.id, Game.team2_id == team.id))
         .filter(
             Game.game_state == GameState.history
         )  # ✅ Check both home & away matches
@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.models import Base
 from app.models.user import User
 from app.models.betting_league import BettingLeague
+from app.models.league_membership import LeagueMembership
+from app.services.leaderboards import global_leaderboard_page, global_rank
+from app.services.league_memberships import members_by_league, user_league_ids
 from app.utils.database import get_db
-from app.schemas.user import UserCreate, UserLogin, UserResponse
+from app.schemas.user import (
+    LeaderboardEntry,
+    RankResponse,
+    UserCreate,
+    UserLogin,
+    UserResponse,
+)
 from app.schemas.bet import BetResponse
 from app.schemas.betting_league import BettingLeagueResponse
-from app.utils.auth import create_access_token, pwd_context, get_current_user
+from app.utils.auth import create_access_token, get_current_user
+from app.utils.password_hashing import PasswordHasherBusy, password_hasher
 from app.services.user_gameday_budget_setter import set_gameday_budget
 from app.utils.logger import get_logger
+from app.config import settings
 from datetime import datetime
 
 
@@ -22,62 +34,96 @@ router = APIRouter(
 logger = get_logger("router.user")
 
 # Routes
+def password_hasher_busy() -> HTTPException:
+    logger.warning("⚠️ Password hashing queue is full")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/login", response_model=dict)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: Session = Depends(get_db)):
     """
     Login using username and password.
+    Password checks run in the password hashing pool; database work runs in
+    the threadpool so the event loop is never blocked.
     """
-    db_user = db.query(User).filter(User.username == user.username).first()
-    if not db_user or not pwd_context.verify(user.password, db_user.hashed_password):
+    db_user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == user.username).first()
+    )
+    valid = False
+    if db_user:
+        try:
+            valid, new_hash = await password_hasher.verify_and_update(
+                user.password, db_user.hashed_password
+            )
+        except PasswordHasherBusy:
+            raise password_hasher_busy()
+    if not valid:
         logger.error(f"Invalid login attempt for user {user.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
 
-    access_token = create_access_token(user_id=db_user.id)
-    logger.info(f"User {user.username} logged in successfully")
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": {
-            "id": db_user.id,
-            "username": db_user.username,
-            "email": db_user.email,
-            "points": db_user.points,
-        },
+    user_data = {
+        "id": db_user.id,
+        "username": db_user.username,
+        "email": db_user.email,
+        "points": db_user.points,
     }
+    if new_hash:
+        # ✅ Stored hash used outdated bcrypt parameters, replace it
+        db_user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
+        logger.info(f"Rehashed password of user {user.username}")
+
+    access_token = create_access_token(user_id=user_data["id"])
+    logger.info(f"User {user.username} logged in successfully")
+    return {"access_token": access_token, "token_type": "bearer", "user": user_data}
 
 
 @router.post("/register", response_model=dict)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user.
     """
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == user.email).first()
+    )
     if db_user:
         logger.error(f"User {user.username} already exists")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    hashed_password = pwd_context.hash(user.password)
-    new_user = User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_password,
-        last_updated_at=datetime.utcnow(),
-    )
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise password_hasher_busy()
+
+    def create_user() -> int:
+        new_user = User(
+            username=user.username,
+            email=user.email,
+            hashed_password=hashed_password,
+            last_updated_at=datetime.utcnow(),
+        )
+
+        gameday_budget_dict = set_gameday_budget(db)
+        new_user.gameday_budget = gameday_budget_dict
 
-    gameday_budget_dict = set_gameday_budget(db)
-    new_user.gameday_budget = gameday_budget_dict
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+        return new_user.id
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    new_user_id = await run_in_threadpool(create_user)
 
     logger.info(f"User {user.username} registered successfully")
-    access_token = create_access_token(user_id=new_user.id)
+    access_token = create_access_token(user_id=new_user_id)
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -98,7 +144,7 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
         id=user.id,
         username=user.username,
         email=user.email,
-        betting_leagues=user.betting_leagues,
+        betting_leagues=user_league_ids(db, user.id),
     )
 
 
@@ -117,6 +163,26 @@ def get_user_points(user_id: int, db: Session = Depends(get_db)):
     return {"points": user.points}
 
 
+@router.get("/{user_id}/rank", response_model=RankResponse)
+def get_user_rank(
+    user_id: int,
+    neighbours: int = Query(1, ge=0, le=10),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the user's rank on the global leaderboard, with the users just above
+    and below.
+    """
+    rank = global_rank(db, user_id, neighbours)
+    if rank is None:
+        logger.error(f"User {user_id} does not exist")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    return rank
+
+
 @router.get("/{user_id}/bets", response_model=List[BetResponse])
 def get_user_bets(user_id: int, db: Session = Depends(get_db)):
     """
@@ -170,16 +236,19 @@ def get_gameday_budget(user_id: int, selected_date: str, db: Session = Depends(g
     return {"budget": budget}
 
 
-@router.get("/leaderboard", response_model=list[dict])
-def get_leaderboard(db: Session = Depends(get_db)):
+@router.get("/leaderboard", response_model=list[LeaderboardEntry])
+def get_leaderboard(
+    limit: int = Query(
+        settings.LEADERBOARD_PAGE_SIZE, ge=1, le=settings.LEADERBOARD_MAX_PAGE_SIZE
+    ),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieve the leaderboard for all users.
+    Retrieve a page of the leaderboard for all users, highest points first.
+    Tied users share a rank.
     """
-    users = db.query(User).order_by(User.points.desc()).all()
-    if not users:
-        return []  # ✅ Ensure response is always an array
-
-    return [{"username": user.username, "points": user.points} for user in users]
+    return global_leaderboard_page(db, limit, offset)
 
 
 @router.get("/{user_id}/leagues", response_model=list[BettingLeagueResponse])
@@ -194,15 +263,24 @@ def get_user_leagues(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found")
 
     leagues = (
-        db.query(BettingLeague).filter(BettingLeague.id.in_(user.betting_leagues)).all()
+        db.query(BettingLeague)
+        .join(LeagueMembership, LeagueMembership.league_id == BettingLeague.id)
+        .filter(LeagueMembership.user_id == user_id)
+        .all()
     )
+    members = members_by_league(db, [league.id for league in leagues])
 
     return [
         {
             "id": league.id,
             "name": league.name,
+            "description": league.description,
+            "manager_id": league.manager_id,
+            "public": league.public,
+            "group_picture": league.group_picture,
             "code": league.code,
-            "members": league.members,
+            "members": members[league.id],
+            "num_members": len(members[league.id]),
         }
         for league in leagues
     ]
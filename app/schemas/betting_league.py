@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from datetime import datetime
 from typing import Optional
 
 
@@ -27,3 +28,26 @@ class BettingLeagueResponse(BettingLeagueBase):
         None, description="The number of members in the league"
     )
     code: Optional[str] = Field(None, description="The code of the league")
+
+
+class LeagueSummary(BaseModel):
+    id: int = Field(..., description="The id of the league")
+    name: str = Field(..., description="The name of the league")
+    description: Optional[str] = Field(
+        None, description="The description of the league"
+    )
+    manager_id: int = Field(..., description="The id of the manager of the league")
+    group_picture: Optional[str] = Field(
+        None, description="The group picture of the league"
+    )
+    num_members: int = Field(..., description="The number of members in the league")
+    last_activity_at: datetime = Field(
+        ..., description="When someone last joined, left or chatted in the league"
+    )
+
+
+class LeagueDiscoveryPage(BaseModel):
+    leagues: list[LeagueSummary] = Field(..., description="A page of public leagues")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, or None on the last page"
+    )
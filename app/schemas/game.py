@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from datetime import datetime
 from typing import Optional
+from app.utils.logo_assets import team_logo_url
 import enum
 
 
@@ -33,6 +34,22 @@ class GameResponse(GameBase):
     class Config:
         from_attributes = True  # ✅ Enables SQLAlchemy ORM compatibility
 
+    @model_validator(mode="after")
+    def fill_team_logos(self):
+        """Fill logo URLs from the built logo manifest."""
+        if self.team1_logo is None:
+            self.team1_logo = team_logo_url(self.team1)
+        if self.team2_logo is None:
+            self.team2_logo = team_logo_url(self.team2)
+        return self
+
+
+class OddsPoint(BaseModel):
+    ts: datetime
+    team1_odds: Optional[float] = None
+    team2_odds: Optional[float] = None
+    draw_odds: Optional[float] = None
+
 
 class GameState(str, enum.Enum):
     upcoming = "upcoming"
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 from typing import Optional, Dict, Any
+from app.utils.logo_assets import team_logo_url
 
 
 class TeamBase(BaseModel):
@@ -15,6 +16,13 @@ class TeamBase(BaseModel):
     class Config:
         orm_mode = True
 
+    @model_validator(mode="after")
+    def fill_logo_url(self):
+        """Fill the logo URL from the built logo manifest."""
+        if not self.logo_url:
+            self.logo_url = team_logo_url(self.name) or ""
+        return self
+
 
 class TeamResponse(TeamBase):
     pass
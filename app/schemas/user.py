@@ -41,6 +41,28 @@ class UserResponse(BaseModel):
         orm_mode = True
 
 
+class LeaderboardEntry(BaseModel):
+    rank: int = Field(..., description="Rank on the leaderboard, shared by tied users")
+    id: int = Field(..., description="The user's unique identifier")
+    username: str = Field(..., description="The username of the user")
+    points: int = Field(..., description="The user's total points")
+
+
+class RankResponse(BaseModel):
+    rank: int = Field(..., description="The user's rank, shared by tied users")
+    total: int = Field(..., description="Number of ranked users")
+    percentile: float = Field(
+        ..., description="Percentage of the other users not ranked above the user"
+    )
+    user: LeaderboardEntry = Field(..., description="The user's leaderboard entry")
+    above: List[LeaderboardEntry] = Field(
+        default=[], description="The users just above, best first"
+    )
+    below: List[LeaderboardEntry] = Field(
+        default=[], description="The users just below, best first"
+    )
+
+
 class TokenResponse(BaseModel):
     access_token: str = Field(..., description="The JWT access token.")
     token_type: str = Field(..., description="The token type (e.g., bearer).")
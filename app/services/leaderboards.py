@@ -0,0 +1,362 @@
+import threading
+import time
+from typing import Optional
+from sortedcontainers import SortedList
+from sqlalchemy import and_, event, func, inspect, or_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.league_membership import LeagueMembership
+from app.models.user import User
+
+# Session.info key collecting what a transaction made stale until it commits
+STALE_KEY = "stale_leaderboards"
+# Marks every league stale (points changed)
+ALL_LEAGUES = "all"
+# Session.info key collecting user changes for the global leaderboard
+CHANGED_USERS_KEY = "leaderboard_users"
+
+
+def rank_window(entries: list[dict], position: int, total: int) -> dict:
+    """
+    Rank lookup response from the entries around a user: `entries` is a slice
+    of the leaderboard and `position` the user's index in it. The percentile
+    is the share of the other users not ranked above (ties count as not above).
+    """
+    entry = entries[position]
+    not_above = total - entry["rank"]
+    return {
+        "rank": entry["rank"],
+        "total": total,
+        "percentile": round(100 * not_above / (total - 1), 1) if total > 1 else 100.0,
+        "user": entry,
+        "above": entries[:position],
+        "below": entries[position + 1 :],
+    }
+
+
+class LeaderboardCache:
+    """
+    Ranked leaderboards by league id, dropped when points or memberships
+    change. Entries also expire after `ttl` seconds so other workers, which do
+    not see this worker's commits, are never stale for longer than that.
+    """
+
+    def __init__(self, ttl: float = settings.LEADERBOARD_CACHE_SECONDS):
+        self.ttl = ttl
+        self._entries: dict[int, tuple[float, list[dict]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, league_id: int) -> Optional[list[dict]]:
+        with self._lock:
+            entry = self._entries.get(league_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def store(self, league_id: int, ranked: list[dict]):
+        with self._lock:
+            self._entries[league_id] = (time.monotonic(), ranked)
+
+    def invalidate(self, league_ids=None):
+        """Drops the given leagues, or every league when `league_ids` is None."""
+        with self._lock:
+            if league_ids is None:
+                self._entries.clear()
+            for league_id in league_ids or ():
+                self._entries.pop(league_id, None)
+
+
+league_leaderboards = LeaderboardCache()
+
+
+class GlobalLeaderboard:
+    """
+    Every user ordered by points, kept in memory as a SortedList of
+    (-points, user_id) keys, an order-statistic structure: inserts, removals
+    and rank lookups are O(log n). Loaded with `rebuild` and updated in place from
+    committed changes, so pages and ranks are binary searches instead of a
+    sort of the users table. Other workers' commits are only seen by a
+    rebuild, so it is reloaded once it is older than `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = settings.LEADERBOARD_CACHE_SECONDS):
+        self.ttl = ttl
+        self.loaded_at: Optional[float] = None
+        self._keys = SortedList()
+        self._users: dict[int, tuple[str, int]] = {}
+        # Changes committed while a rebuild is querying, replayed on its snapshot
+        self._journal: Optional[dict[int, Optional[tuple[str, int]]]] = None
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    @property
+    def stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def rebuild(self, db: Session):
+        with self._rebuild_lock:
+            with self._lock:
+                self._journal = {}
+            try:
+                rows = db.query(User.id, User.username, User.points).all()
+            except Exception:
+                with self._lock:
+                    self._journal = None
+                raise
+            users = {
+                user_id: (username, points or 0) for user_id, username, points in rows
+            }
+            with self._lock:
+                for user_id, user in self._journal.items():
+                    if user is None:
+                        users.pop(user_id, None)
+                    else:
+                        users[user_id] = user
+                self._journal = None
+                self._users = users
+                self._keys = SortedList(
+                    (-points, user_id) for user_id, (_, points) in users.items()
+                )
+                self.loaded_at = time.monotonic()
+
+    def refresh(self, db: Session):
+        """Rebuilds the leaderboard if it is stale, once for concurrent callers."""
+        if not self.stale:
+            return
+        with self._rebuild_lock:
+            if not self.stale:
+                return
+            self.rebuild(db)
+
+    def update(self, user_id: int, username: str, points: int):
+        with self._lock:
+            if self._journal is not None:
+                self._journal[user_id] = (username, points)
+            self._remove(user_id)
+            self._users[user_id] = (username, points)
+            self._keys.add((-points, user_id))
+
+    def remove(self, user_id: int):
+        with self._lock:
+            if self._journal is not None:
+                self._journal[user_id] = None
+            self._remove(user_id)
+
+    def _remove(self, user_id: int):
+        if user_id not in self._users:
+            return
+        _, points = self._users.pop(user_id)
+        self._keys.remove((-points, user_id))
+
+    def _rank(self, points: int) -> int:
+        # Users with more points + 1, so ties share a rank
+        return self._keys.bisect_left((-points,)) + 1
+
+    def _entries(self, keys) -> list[dict]:
+        return [
+            {
+                "rank": self._rank(-negative_points),
+                "id": user_id,
+                "username": self._users[user_id][0],
+                "points": -negative_points,
+            }
+            for negative_points, user_id in keys
+        ]
+
+    def page(self, limit: int, offset: int = 0) -> list[dict]:
+        with self._lock:
+            return self._entries(self._keys.islice(offset, offset + limit))
+
+    def around(self, user_id: int, neighbours: int = 1) -> Optional[dict]:
+        """A user's rank with up to `neighbours` users above and below."""
+        with self._lock:
+            if user_id not in self._users:
+                return None
+            _, points = self._users[user_id]
+            position = self._keys.index((-points, user_id))
+            start = max(position - neighbours, 0)
+            entries = self._entries(self._keys.islice(start, position + neighbours + 1))
+            return rank_window(entries, position - start, len(self._keys))
+
+
+global_leaderboard = GlobalLeaderboard()
+
+
+def global_leaderboard_page(db: Session, limit: int, offset: int = 0) -> list[dict]:
+    global_leaderboard.refresh(db)
+    return global_leaderboard.page(limit, offset)
+
+
+def sql_rank_window(
+    db: Session,
+    user_id: int,
+    neighbours: int = 1,
+    league_id: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    A user's rank among all users, or among a league's members, read from the
+    database: a count of users with more points and keyset reads for the
+    neighbours, so the cost does not grow with the number of users returned.
+    """
+
+    def users(*columns):
+        query = db.query(*columns)
+        if league_id is not None:
+            query = query.join(
+                LeagueMembership, LeagueMembership.user_id == User.id
+            ).filter(LeagueMembership.league_id == league_id)
+        return query
+
+    user = users(User.id, User.username, User.points).filter(User.id == user_id)
+    user = user.first()
+    if user is None:
+        return None
+    points = user.points or 0
+
+    def rank_of(points: int) -> int:
+        return users(func.count(User.id)).filter(User.points > points).scalar() + 1
+
+    above = (
+        users(User.id, User.username, User.points)
+        .filter(
+            or_(User.points > points, and_(User.points == points, User.id < user_id))
+        )
+        .order_by(User.points, User.id.desc())
+        .limit(neighbours)
+        .all()
+    )
+    below = (
+        users(User.id, User.username, User.points)
+        .filter(
+            or_(User.points < points, and_(User.points == points, User.id > user_id))
+        )
+        .order_by(User.points.desc(), User.id)
+        .limit(neighbours)
+        .all()
+    )
+    ranks, entries = {}, []
+    for row in [*reversed(above), user, *below]:
+        row_points = row.points or 0
+        if row_points not in ranks:
+            ranks[row_points] = rank_of(row_points)
+        entries.append(
+            {
+                "rank": ranks[row_points],
+                "id": row.id,
+                "username": row.username,
+                "points": row_points,
+            }
+        )
+    total = users(func.count(User.id)).scalar()
+    return rank_window(entries, len(above), total)
+
+
+def rank_league(db: Session, league_id: int) -> list[dict]:
+    """
+    Members of a league with their standard competition rank (ties share a
+    rank and the next rank is skipped), computed by Postgres.
+    """
+    rank = func.rank().over(order_by=User.points.desc()).label("rank")
+    rows = (
+        db.query(rank, User.id, User.username, User.points)
+        .join(LeagueMembership, LeagueMembership.user_id == User.id)
+        .filter(LeagueMembership.league_id == league_id)
+        .order_by(rank, User.id)
+    )
+    return [
+        {"rank": rank, "id": user_id, "username": username, "points": points or 0}
+        for rank, user_id, username, points in rows
+    ]
+
+
+def ranked_league(db: Session, league_id: int) -> list[dict]:
+    """A league's ranked members, ranked once and then served from cache."""
+    ranked = league_leaderboards.get(league_id)
+    if ranked is None:
+        ranked = rank_league(db, league_id)
+        league_leaderboards.store(league_id, ranked)
+    return ranked
+
+
+def league_leaderboard(
+    db: Session, league_id: int, limit: int, offset: int = 0
+) -> list[dict]:
+    return ranked_league(db, league_id)[offset : offset + limit]
+
+
+def league_rank(
+    db: Session, league_id: int, user_id: int, neighbours: int = 1
+) -> Optional[dict]:
+    """A member's rank in a league with up to `neighbours` members above and below."""
+    return sql_rank_window(db, user_id, neighbours, league_id=league_id)
+
+
+def global_rank(db: Session, user_id: int, neighbours: int = 1) -> Optional[dict]:
+    global_leaderboard.refresh(db)
+    rank = global_leaderboard.around(user_id, neighbours)
+    if rank is None:
+        # ✅ Registered on another worker since the last rebuild
+        rank = sql_rank_window(db, user_id, neighbours)
+    return rank
+
+
+def mark_stale(db: Session, league_id: Optional[int] = None):
+    """
+    Marks a league's leaderboard (or all of them) stale once `db` commits.
+    For changes the flush hook cannot see, like bulk deletes.
+    """
+    stale = db.info.setdefault(STALE_KEY, set())
+    stale.add(ALL_LEAGUES if league_id is None else league_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_leaderboard_changes(session: Session, flush_context):
+    changed_users = session.info.setdefault(CHANGED_USERS_KEY, {})
+    for instance in session.dirty:
+        if (
+            isinstance(instance, User)
+            and inspect(instance).attrs.points.history.has_changes()
+        ):
+            mark_stale(session)
+            changed_users[instance.id] = (instance.username, instance.points or 0)
+    for instance in session.new:
+        if isinstance(instance, LeagueMembership):
+            mark_stale(session, instance.league_id)
+        elif isinstance(instance, User):
+            changed_users[instance.id] = (instance.username, instance.points or 0)
+    for instance in session.deleted:
+        if isinstance(instance, LeagueMembership):
+            mark_stale(session, instance.league_id)
+        elif isinstance(instance, User):
+            mark_stale(session)
+            changed_users[instance.id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_leaderboard_changes(session: Session):
+    for user_id, user in session.info.pop(CHANGED_USERS_KEY, {}).items():
+        if user is None:
+            global_leaderboard.remove(user_id)
+        else:
+            global_leaderboard.update(user_id, *user)
+
+    stale = session.info.pop(STALE_KEY, None)
+    if not stale:
+        return
+    if ALL_LEAGUES in stale:
+        league_leaderboards.invalidate()
+    else:
+        league_leaderboards.invalidate(stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_leaderboard_changes(session: Session):
+    session.info.pop(STALE_KEY, None)
+    session.info.pop(CHANGED_USERS_KEY, None)
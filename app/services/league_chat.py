@@ -0,0 +1,129 @@
+import json
+import select
+import threading
+import time
+from app.config import settings
+from app.models.league_chat_message import LeagueChatMessage
+from app.utils.broadcaster import Broadcaster
+from app.utils.database import engine
+from app.utils.logger import get_logger
+
+logger = get_logger("league_chat")
+
+NOTIFY_CHANNEL = "league_chat"
+
+# One hub per league with open connections, created on first subscriber
+chat_hubs: dict[int, Broadcaster] = {}
+
+
+def hub_for(league_id: int) -> Broadcaster:
+    if league_id not in chat_hubs:
+        chat_hubs[league_id] = Broadcaster(
+            f"league_chat:{league_id}", queue_size=settings.CHAT_STREAM_QUEUE_SIZE
+        )
+    return chat_hubs[league_id]
+
+
+def release_hub(league_id: int):
+    """Forgets a league's hub once its last connection is gone."""
+    hub = chat_hubs.get(league_id)
+    if hub is not None and hub.subscriber_count == 0:
+        del chat_hubs[league_id]
+
+
+def deliver(event: dict):
+    """Pushes a chat event to this worker's connections for its league."""
+    hub = chat_hubs.get(event["league_id"])
+    if hub is not None:
+        hub.publish(event)
+
+
+def chat_event(event_type: str, message: LeagueChatMessage) -> dict:
+    """Event sent to chat sockets; `event_type` is "message", "edit" or "delete"."""
+    return {
+        "type": event_type,
+        "league_id": message.league_id,
+        "message": {
+            "id": message.id,
+            "user_id": message.user_id,
+            "username": message.username,
+            "content": message.content,
+            "timestamp": message.timestamp.isoformat(),
+        },
+    }
+
+
+class InProcessBroker:
+    """Delivers events to the connections of this worker only."""
+
+    def start(self):
+        pass
+
+    def publish(self, event: dict):
+        deliver(event)
+
+
+class PostgresBroker:
+    """
+    Carries events between workers with Postgres LISTEN/NOTIFY: every worker
+    publishes with pg_notify and a listener thread per worker delivers what it
+    receives (its own events included) to the local hubs.
+    """
+
+    def __init__(self, channel: str = NOTIFY_CHANNEL):
+        self.channel = channel
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen, daemon=True)
+            self._thread.start()
+
+    def publish(self, event: dict):
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "SELECT pg_notify(%s, %s)", (self.channel, json.dumps(event))
+            )
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except Exception as e:
+                logger.error(f"❌ Chat listener failed: {e}. Reconnecting in 5s")
+                time.sleep(5)
+
+    def _listen_once(self):
+        connection = engine.raw_connection()
+        try:
+            driver_connection = connection.driver_connection
+            driver_connection.autocommit = True
+            with driver_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+            logger.info(f"📡 Listening for chat events on {self.channel}")
+            while True:
+                if select.select([driver_connection], [], [], 60) == ([], [], []):
+                    continue
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    notification = driver_connection.notifies.pop(0)
+                    try:
+                        deliver(json.loads(notification.payload))
+                    except (ValueError, KeyError) as e:
+                        logger.error(f"❌ Bad chat notification: {e}")
+        finally:
+            connection.close()
+
+
+BROKERS = {"memory": InProcessBroker, "postgres": PostgresBroker}
+
+chat_broker = BROKERS[settings.CHAT_BROKER]()
+
+
+def publish_chat_event(event: dict):
+    """Publishes a committed chat change built by `chat_event`."""
+    try:
+        chat_broker.publish(event)
+    except Exception as e:
+        # Clients still get the change on their next page load
+        logger.error(f"❌ Failed to publish chat event: {e}")
@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import or_, tuple_
+from sqlalchemy.orm import Session
+from app.models.betting_league import BettingLeague
+
+# Sort keys of the discovery endpoint, each backed by a partial index on public leagues
+SORT_COLUMNS = {
+    "members": BettingLeague.member_count,
+    "activity": BettingLeague.last_activity_at,
+}
+
+
+def encode_cursor(sort: str, league: BettingLeague) -> str:
+    value = getattr(league, SORT_COLUMNS[sort].key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, league.id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(sort: str, cursor: str) -> tuple:
+    """(sort value, league id) of the last league of the previous page."""
+    try:
+        cursor_sort, value, league_id = json.loads(base64.urlsafe_b64decode(cursor))
+        if cursor_sort != sort or not isinstance(league_id, int):
+            raise ValueError
+        if sort == "activity":
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, int):
+            raise ValueError
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    return value, league_id
+
+
+def search_pattern(query: str) -> str:
+    """ILIKE pattern matching `query` anywhere, with its wildcards escaped."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def discover_leagues(
+    db: Session,
+    query: Optional[str],
+    sort: str,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> tuple[list[BettingLeague], Optional[str]]:
+    """
+    A page of public leagues, optionally matching `query` in their name or
+    description (served by the trigram indexes), ordered by `sort` then id,
+    both descending. Returns the leagues and the cursor of the next page.
+    """
+    column = SORT_COLUMNS[sort]
+    leagues = db.query(BettingLeague).filter(BettingLeague.public == True)
+    if query:
+        pattern = search_pattern(query)
+        leagues = leagues.filter(
+            or_(
+                BettingLeague.name.ilike(pattern),
+                BettingLeague.description.ilike(pattern),
+            )
+        )
+    if cursor:
+        value, league_id = decode_cursor(sort, cursor)
+        leagues = leagues.filter(tuple_(column, BettingLeague.id) < (value, league_id))
+
+    page = (
+        leagues.order_by(column.desc(), BettingLeague.id.desc()).limit(limit + 1).all()
+    )
+    next_cursor = encode_cursor(sort, page[limit - 1]) if len(page) > limit else None
+    return page[:limit], next_cursor
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from typing import Iterable
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.betting_league import BettingLeague
+from app.models.league_membership import LeagueMembership
+from app.models.user import User
+from app.services.leaderboards import mark_stale
+
+
+def record_league_activity(db: Session, league_id: int, member_delta: int = 0):
+    """
+    Bumps a league's last_activity_at and adjusts its member_count in place,
+    so discovery never has to count memberships. The caller commits.
+    """
+    values = {BettingLeague.last_activity_at: func.now()}
+    if member_delta:
+        values[BettingLeague.member_count] = BettingLeague.member_count + member_delta
+    db.query(BettingLeague).filter(BettingLeague.id == league_id).update(
+        values, synchronize_session=False
+    )
+
+
+def is_member(db: Session, league_id: int, user_id: int) -> bool:
+    return db.get(LeagueMembership, (league_id, user_id)) is not None
+
+
+def add_member(
+    db: Session,
+    league_id: int,
+    user_id: int,
+    role: str = LeagueMembership.ROLE_MEMBER,
+) -> LeagueMembership:
+    """Adds a membership row and counts it on the league; the caller commits."""
+    membership = LeagueMembership(league_id=league_id, user_id=user_id, role=role)
+    db.add(membership)
+    record_league_activity(db, league_id, member_delta=1)
+    return membership
+
+
+def remove_member(db: Session, league_id: int, user_id: int) -> bool:
+    """Deletes a membership row; the caller commits. Returns False if there was none."""
+    deleted = (
+        db.query(LeagueMembership)
+        .filter(
+            LeagueMembership.league_id == league_id,
+            LeagueMembership.user_id == user_id,
+        )
+        .delete(synchronize_session=False)
+    )
+    if deleted:
+        mark_stale(db, league_id)  # Bulk deletes skip the flush hook
+        record_league_activity(db, league_id, member_delta=-1)
+    return deleted > 0
+
+
+def members_by_league(db: Session, league_ids: Iterable[int]) -> dict[int, list[dict]]:
+    """
+    Members of every given league as {id, username, points} dicts, highest
+    points first, read with a single join so the points are always current.
+    """
+    league_ids = list(league_ids)
+    members = defaultdict(list)
+    if not league_ids:
+        return members
+    rows = (
+        db.query(LeagueMembership.league_id, User.id, User.username, User.points)
+        .join(User, User.id == LeagueMembership.user_id)
+        .filter(LeagueMembership.league_id.in_(league_ids))
+        .order_by(LeagueMembership.league_id, User.points.desc(), User.id)
+    )
+    for league_id, user_id, username, points in rows:
+        members[league_id].append(
+            {"id": user_id, "username": username, "points": points}
+        )
+    return members
+
+
+def league_members(db: Session, league_id: int) -> list[dict]:
+    return members_by_league(db, [league_id])[league_id]
+
+
+def user_league_ids(db: Session, user_id: int) -> list[int]:
+    return [
+        league_id
+        for (league_id,) in db.query(LeagueMembership.league_id)
+        .filter(LeagueMembership.user_id == user_id)
+        .order_by(LeagueMembership.joined_at)
+    ]
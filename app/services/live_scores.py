@@ -0,0 +1,83 @@
+import json
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.game import Game
+from app.schemas.game import GameState
+from app.utils.broadcaster import Broadcaster
+
+LIVE_FIELDS = (
+    "score_team1",
+    "score_team2",
+    "penalty_score_team1",
+    "penalty_score_team2",
+    "game_state",
+    "game_winner",
+)
+
+live_scores = Broadcaster("live_scores", queue_size=settings.LIVE_STREAM_QUEUE_SIZE)
+
+# Latest pushed payload per game in progress, sent to every new connection on
+# subscribe. Games leave it when they finish, so it stays as small as a gameday
+latest_payloads: dict[int, dict] = {}
+
+
+def game_payload(game: Game) -> dict:
+    payload = {"id": game.id, "team1": game.team1, "team2": game.team2}
+    for field in LIVE_FIELDS:
+        value = getattr(game, field)
+        payload[field] = getattr(value, "value", value)
+    return payload
+
+
+def format_sse(payload: dict) -> str:
+    return f"event: score\nid: {payload['id']}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def live_score_events():
+    """
+    Yields SSE frames: the latest known state of every game in progress first,
+    then every change as it is committed.
+    """
+    async for payload in live_scores.listen(
+        initial=list(latest_payloads.values()),
+        keepalive=settings.LIVE_STREAM_KEEPALIVE_SECONDS,
+    ):
+        yield ": keepalive\n\n" if payload is None else format_sse(payload)
+
+
+@event.listens_for(Session, "after_flush")
+def collect_game_changes(session: Session, flush_context):
+    """
+    Records games whose live fields changed in this flush.
+    They are only published once the transaction commits.
+    """
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Game) or obj.id is None:
+            continue
+        state = inspect(obj)
+        if obj in session.new or any(
+            state.attrs[field].history.has_changes() for field in LIVE_FIELDS
+        ):
+            session.info.setdefault("live_score_changes", {})[obj.id] = game_payload(
+                obj
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def publish_game_changes(session: Session):
+    changes = session.info.pop("live_score_changes", None)
+    if not changes:
+        return
+    for game_id, payload in changes.items():
+        if payload["game_state"] == GameState.ongoing.value:
+            latest_payloads[game_id] = payload
+        else:
+            # ✅ Upcoming and finished games are not replayed to new connections
+            latest_payloads.pop(game_id, None)
+        live_scores.publish(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_game_changes(session: Session):
+    session.info.pop("live_score_changes", None)
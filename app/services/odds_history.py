@@ -0,0 +1,151 @@
+from datetime import datetime
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
+from app.models.game import Game
+from app.models.odds_snapshot import OddsSnapshot
+from app.utils.logger import get_logger
+
+logger = get_logger("odds_history")
+
+SMALLINT_MAX = 32767
+
+# Partitions created by this process in committed transactions
+_known_partitions: set[str] = set()
+# Session.info key of partitions created by the open transaction
+PENDING_PARTITIONS_KEY = "pending_partitions"
+
+
+def scale_odds(value):
+    if value is None:
+        return None
+    return max(0, min(round(value * OddsSnapshot.ODDS_SCALE), SMALLINT_MAX))
+
+
+def unscale_odds(value):
+    if value is None:
+        return None
+    return value / OddsSnapshot.ODDS_SCALE
+
+
+def ensure_partition(db: Session, ts: datetime):
+    """Creates the monthly partition holding `ts` if it doesn't exist yet."""
+    partition = f"odds_snapshots_{ts:%Y_%m}"
+    pending = db.info.setdefault(PENDING_PARTITIONS_KEY, set())
+    if partition in _known_partitions or partition in pending:
+        return
+
+    month_start = datetime(ts.year, ts.month, 1)
+    if ts.month == 12:
+        next_month_start = datetime(ts.year + 1, 1, 1)
+    else:
+        next_month_start = datetime(ts.year, ts.month + 1, 1)
+
+    db.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF odds_snapshots "
+            f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{next_month_start.isoformat()}')"
+        )
+    )
+    # ✅ Only trusted once committed, a rollback also undoes the CREATE
+    pending.add(partition)
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_partitions(session: Session):
+    _known_partitions.update(session.info.pop(PENDING_PARTITIONS_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_partitions(session: Session):
+    session.info.pop(PENDING_PARTITIONS_KEY, None)
+
+
+def record_odds_snapshots(db: Session, games: list[Game]) -> int:
+    """
+    Appends a snapshot for every game whose odds differ from its latest stored snapshot.
+    Games must be flushed (have an id). The caller commits.
+    """
+    games = [
+        game
+        for game in games
+        if game.id is not None
+        and (game.team1_odds, game.team2_odds, game.draw_odds) != (None, None, None)
+    ]
+    if not games:
+        return 0
+
+    latest = {
+        snapshot.game_id: (
+            snapshot.team1_odds,
+            snapshot.team2_odds,
+            snapshot.draw_odds,
+        )
+        for snapshot in db.query(OddsSnapshot)
+        .filter(OddsSnapshot.game_id.in_([game.id for game in games]))
+        .distinct(OddsSnapshot.game_id)
+        .order_by(OddsSnapshot.game_id, OddsSnapshot.ts.desc())
+        .all()
+    }
+
+    now = datetime.utcnow()
+    rows = []
+    for game in games:
+        scaled = (
+            scale_odds(game.team1_odds),
+            scale_odds(game.team2_odds),
+            scale_odds(game.draw_odds),
+        )
+        if latest.get(game.id) == scaled:
+            continue
+        rows.append(
+            {
+                "game_id": game.id,
+                "ts": now,
+                "team1_odds": scaled[0],
+                "team2_odds": scaled[1],
+                "draw_odds": scaled[2],
+            }
+        )
+
+    if rows:
+        ensure_partition(db, now)
+        db.execute(insert(OddsSnapshot), rows)
+        logger.info(f"📈 Recorded {len(rows)} odds snapshots")
+    return len(rows)
+
+
+def get_odds_series(db: Session, game_id: int, points: int) -> list[dict]:
+    """
+    Returns the odds history of a game downsampled to at most `points` entries.
+    The series is split into equal time buckets and the last snapshot of each
+    bucket is kept, so the first and last values are always preserved.
+    """
+    snapshots = (
+        db.query(OddsSnapshot)
+        .filter(OddsSnapshot.game_id == game_id)
+        .order_by(OddsSnapshot.ts)
+        .all()
+    )
+
+    if len(snapshots) > points:
+        first_ts = snapshots[0].ts
+        span = (snapshots[-1].ts - first_ts).total_seconds() or 1
+        by_bucket = {0: snapshots[0]}
+        for snapshot in snapshots[1:]:
+            bucket = min(
+                int((snapshot.ts - first_ts).total_seconds() / span * (points - 1)),
+                points - 2,
+            )
+            by_bucket[bucket + 1] = snapshot
+        snapshots = [by_bucket[bucket] for bucket in sorted(by_bucket)]
+
+    return [
+        {
+            "ts": snapshot.ts,
+            "team1_odds": unscale_odds(snapshot.team1_odds),
+            "team2_odds": unscale_odds(snapshot.team2_odds),
+            "draw_odds": unscale_odds(snapshot.draw_odds),
+        }
+        for snapshot in snapshots
+    ]
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import unicodedata
+from datetime import datetime
+from typing import NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.models.scrape_state import ScrapeState
+from app.utils.logger import get_logger
+
+logger = get_logger("scrape_state")
+
+
+class TableChanges(NamedTuple):
+    row_hashes: dict[str, str]
+    changed: set[str]  # Keys of new rows and rows whose content changed
+    removed: set[str]  # Keys of rows that are no longer in the table
+
+
+def _normalize(cell) -> str:
+    return " ".join(unicodedata.normalize("NFC", str(cell)).split())
+
+
+def row_hash(cells) -> str:
+    """Hashes a row's cells after normalizing unicode and whitespace."""
+    joined = "\x1f".join(_normalize(cell) for cell in cells)
+    return hashlib.sha256(joined.encode()).hexdigest()
+
+
+def content_hash(row_hashes: dict[str, str]) -> str:
+    """Hashes a whole table from its row hashes, independent of row order."""
+    encoded = json.dumps(sorted(row_hashes.items()), separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def detect_changes(db: Session, key: str, rows: dict) -> Optional[TableChanges]:
+    """
+    Compares a scraped table (row key -> cells) with the last stored state.
+    Returns None when the table is unchanged, otherwise the changed row keys.
+    """
+    row_hashes = {row_key: row_hash(cells) for row_key, cells in rows.items()}
+    state = db.get(ScrapeState, key)
+    if state and state.content_hash == content_hash(row_hashes):
+        return None
+
+    previous = state.row_hashes if state else {}
+    changed = {
+        row_key
+        for row_key, digest in row_hashes.items()
+        if previous.get(row_key) != digest
+    }
+    return TableChanges(row_hashes, changed, set(previous) - set(row_hashes))
+
+
+def save_state(db: Session, key: str, changes: TableChanges):
+    """Stores the table's new state; committed together with the reconciliation."""
+    db.merge(
+        ScrapeState(
+            key=key,
+            content_hash=content_hash(changes.row_hashes),
+            row_hashes=changes.row_hashes,
+            updated_at=datetime.utcnow(),
+        )
+    )
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
+from app.models.team import Team
+from app.models.team_alias import TeamAlias
+from app.utils.logger import get_logger
+
+logger = get_logger("team_aliases")
+
+# Known spellings of every team per source, inserted into team_aliases on startup
+SEED_PATH = Path(__file__).resolve().parent.parent / "data" / "team_aliases.json"
+
+# (source, alias) -> canonical team name, loaded from the team_aliases table
+_aliases: dict[tuple[str, str], str] = {}
+
+
+def seed_team_aliases(db: Session):
+    """Inserts the seed aliases that aren't in the table yet, then loads the table."""
+    seed = json.loads(SEED_PATH.read_text(encoding="utf-8"))
+    existing = set(db.query(TeamAlias.source, TeamAlias.alias))
+    missing = [
+        {"source": source, "alias": alias, "team_name": team_name}
+        for source, aliases in seed.items()
+        for alias, team_name in aliases.items()
+        if (source, alias) not in existing
+    ]
+    if missing:
+        db.bulk_insert_mappings(TeamAlias, missing)
+        db.commit()
+        logger.info(f"✅ Added {len(missing)} team aliases")
+    load_team_aliases(db)
+
+
+def load_team_aliases(db: Session):
+    """Reloads the in-memory alias map from the database."""
+    _aliases.clear()
+    _aliases.update(
+        ((source, alias), team_name)
+        for source, alias, team_name in db.query(
+            TeamAlias.source, TeamAlias.alias, TeamAlias.team_name
+        )
+    )
+
+
+def canonical_team_name(name: str, source: str) -> str:
+    """Returns our name for a team as spelled by `source`; unknown names pass through."""
+    return _aliases.get((source, name), name)
+
+
+def team_ids_by_name(db: Session) -> dict[str, int]:
+    return dict(db.query(Team.name, Team.id))
+
+
+def link_game_teams(db: Session) -> int:
+    """
+    Fills in team1_id / team2_id of games whose teams didn't exist when the
+    game was stored. Returns the number of games linked; the caller commits.
+    """
+    linked = 0
+    for column in ("team1", "team2"):
+        result = db.execute(
+            text(
+                f"""
+                UPDATE games SET {column}_id = teams.id
+                FROM teams
+                WHERE games.{column}_id IS NULL AND teams.name = games.{column}
+                """
+            )
+        )
+        linked += result.rowcount
+    if linked:
+        logger.info(f"🔗 Linked {linked} game teams")
+    return linked
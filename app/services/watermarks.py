@@ -0,0 +1,25 @@
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.ingestion_watermark import IngestionWatermark
+from app.utils.logger import get_logger
+
+logger = get_logger("watermarks")
+
+
+def get_watermark(db: Session, source: str) -> Optional[date]:
+    state = db.get(IngestionWatermark, source)
+    return state.watermark if state else None
+
+
+def advance_watermark(db: Session, source: str, watermark: date):
+    """Moves the source's watermark forward (never back); the caller commits."""
+    state = db.get(IngestionWatermark, source)
+    if state is None:
+        db.add(IngestionWatermark(source=source, watermark=watermark))
+    elif watermark > state.watermark:
+        state.watermark = watermark
+        state.updated_at = datetime.utcnow()
+    else:
+        return
+    logger.info(f"🔖 {source} watermark advanced to {watermark}")
@@ -1,14 +1,25 @@
-import requests
 import json
 import re
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Iterator, Optional
 from ..config import settings
 from app.models.game import Game
 from app.schemas.game import GameState
+from app.services.odds_history import record_odds_snapshots
+from app.services.team_aliases import canonical_team_name, team_ids_by_name
+from app.services.watermarks import advance_watermark, get_watermark
+from app.utils.http_client import http_client
+from app.utils.team_names import normalize_team_key
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 from sqlalchemy.sql import text
 
+HISTORY_WATERMARK_SOURCE = "livescore:history"
+SCORE_PATTERN = re.compile(r"(\d+)\s*-\s*(\d+)")
+# Slack before the first requested match date when preloading games
+GAME_INDEX_PADDING = timedelta(days=1)
+
 
 def fetch_fixtures_data(page):
     params = {
@@ -17,122 +28,181 @@ def fetch_fixtures_data(page):
         "competition_id": settings.LIVE_SCORES_CL_COMP_ID,
         "page": page,
     }
-    response = requests.get(settings.LIVE_SCORES_API_FIXTURES_ENDPOINT, params=params)
-    if response.status_code == 200:
+    response = http_client.get(
+        settings.LIVE_SCORES_API_FIXTURES_ENDPOINT, params=params
+    )
+    if response is not None and response.status_code == 200:
         return response.json()
     else:
-        print("Failed to fetch data from API: ", response.status_code)
+        print(
+            "Failed to fetch data from API: ",
+            response.status_code if response is not None else "no response",
+        )
         return None
 
 
 # Function to fetch data
-def fetch_history_data(page):
+def fetch_history_data(page, from_date: str = settings.LIVE_SCORES_SEASON_START):
     params = {
         "key": settings.LIVE_SCORES_API_KEY,
         "secret": settings.LIVE_SCORES_API_SECRET,
         "competition_id": settings.LIVE_SCORES_CL_COMP_ID,
-        "from": "2024-09-01",
+        "from": from_date,
         "page": page,
     }
-    response = requests.get(settings.LIVE_SCORES_API_HISTORY_ENDPOINT, params=params)
-    if response.status_code == 200:
+    response = http_client.get(settings.LIVE_SCORES_API_HISTORY_ENDPOINT, params=params)
+    if response is not None and response.status_code == 200:
         return response.json()
     else:
-        print("Failed to fetch data from API: ", response.status_code)
+        print(
+            "Failed to fetch data from API: ",
+            response.status_code if response is not None else "no response",
+        )
         return None
 
 
-# Function to filter games by date
-def fetch_all_history_pages():
-    current_page = 1
-    total_pages = 6  # Start with one to ensure the loop runs at least once
+class PagedItems:
+    """
+    The items of every page of a paginated livescore endpoint.
+    The first page tells us `total_pages`; the remaining pages are fetched
+    concurrently and their items streamed in the order the pages arrive.
+    Once iterated, `complete` tells whether every page was fetched and
+    `failed_pages` lists the ones that weren't.
+    """
 
-    all_matches = []
+    def __init__(self, fetch_page, items_key: str):
+        self.fetch_page = fetch_page
+        self.items_key = items_key
+        self.failed_pages: list[int] = []
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed_pages
+
+    def __iter__(self) -> Iterator[dict]:
+        items_key = self.items_key
+        self.failed_pages = []
+        print(f"Fetching {items_key} page 1...")
+        data = self.fetch_page(1)
+        if not (data and data["success"]):
+            print(f"No {items_key} data returned or error encountered")
+            self.failed_pages.append(1)
+            return
+        yield from data["data"][items_key]
+        total_items = len(data["data"][items_key])
+        total_pages = data["data"].get("total_pages", 1)
+
+        with ThreadPoolExecutor(
+            max_workers=settings.LIVE_SCORES_API_MAX_CONCURRENCY
+        ) as executor:
+            futures = {
+                executor.submit(self.fetch_page, page): page
+                for page in range(2, total_pages + 1)
+            }
+            for future in as_completed(futures):
+                data = future.result()
+                if not (data and data["success"]):
+                    print(f"No {items_key} data returned for page {futures[future]}")
+                    self.failed_pages.append(futures[future])
+                    continue
+                yield from data["data"][items_key]
+                total_items += len(data["data"][items_key])
+
+        print(f"Total {items_key} fetched: {total_items} from {total_pages} pages")
+
+
+def fetch_all_history_pages(
+    from_date: str = settings.LIVE_SCORES_SEASON_START,
+) -> PagedItems:
+    return PagedItems(partial(fetch_history_data, from_date=from_date), "match")
 
-    while current_page <= total_pages:
-        print(f"Fetching page {current_page}...")
-        data = fetch_history_data(current_page)
-        if data and data["success"]:
-            all_matches.extend(data["data"]["match"])
-            total_pages = data["data"][
-                "total_pages"
-            ]  # Update total pages from the response
-            current_page += 1
-        else:
-            print("No data returned or error encountered")
-            break
-
-    print(f"Total matches fetched: {len(all_matches)}")
-    return all_matches
-
-
-def fetch_all_fixture_pages():
-    current_page = 1
-    total_pages = 1  # Initialize to 1 to ensure the loop is entered
-    all_fixtures = []
-
-    while current_page <= total_pages:
-        print(f"Fetching fixtures page {current_page}...")
-        data = fetch_fixtures_data(current_page)
-        if data and data["success"]:
-            all_fixtures.extend(data["data"]["fixtures"])  # Accessing fixtures key
-            # Checking if 'next_page' is provided and updating the total_pages and current_page accordingly
-            if "total_pages" in data["data"]:
-                total_pages = data["data"]["total_pages"]
-            current_page += 1
-        else:
-            print("No fixtures data returned or error encountered")
-            break
 
-    print(f"Total fixtures fetched: {len(all_fixtures)}")
-    return all_fixtures
+def history_start_date(db: Session) -> str:
+    """
+    First date to request history from: the watermark minus an overlap window
+    for late corrections, or the season start on the first run.
+    """
+    watermark = get_watermark(db, HISTORY_WATERMARK_SOURCE)
+    if watermark is None:
+        return settings.LIVE_SCORES_SEASON_START
+    overlap = timedelta(days=settings.LIVE_SCORES_HISTORY_OVERLAP_DAYS)
+    start = max(
+        watermark - overlap,
+        date.fromisoformat(settings.LIVE_SCORES_SEASON_START),
+    )
+    return start.isoformat()
 
 
-def fetch_history_games_from_api(db: Session):
-    matches = fetch_all_history_pages()
-    added_games = 0
+def fetch_all_fixture_pages() -> PagedItems:
+    return PagedItems(fetch_fixtures_data, "fixtures")
+
+
+def game_key(team1: str, team2: str, match_time: datetime) -> tuple:
+    return normalize_team_key(team1), normalize_team_key(team2), match_time
+
+
+def load_game_index(db: Session, since: datetime) -> dict[tuple, Game]:
+    """Loads the games from `since` on, keyed on normalized team names and kickoff."""
+    games = db.query(Game).filter(Game.match_time >= since).all()
+    return {game_key(game.team1, game.team2, game.match_time): game for game in games}
+
+
+def parse_api_score(score: Optional[str]) -> tuple[Optional[int], Optional[int]]:
+    score_match = SCORE_PATTERN.search(score or "")
+    if not score_match:
+        return None, None
+    team1_score, team2_score = map(int, score_match.groups())
+    return team1_score, team2_score
+
+
+def fetch_history_games_from_api(
+    db: Session, game_index: Optional[dict[tuple, Game]] = None
+):
+    """
+    Reconciles finished matches with our games in memory: upcoming games get
+    their results and unknown games are added. The caller commits.
+    """
+    from_date = history_start_date(db)
+    print(f"Fetching history from {from_date}")
+    if game_index is None:
+        game_index = load_game_index(
+            db, datetime.fromisoformat(from_date) - GAME_INDEX_PADDING
+        )
+    matches = fetch_all_history_pages(from_date)
+    team_ids = team_ids_by_name(db)
+    added_games, updated_games = [], 0
+    latest_match_date = None
     for match in matches:
-        team1 = match["home_name"]
-        team1_name = api_clean_team_name(team1)
-        team2 = match["away_name"]
-        team2_name = api_clean_team_name(team2)
-        score = match["ft_score"]
+        match_date = date.fromisoformat(match["date"])
+        if latest_match_date is None or match_date > latest_match_date:
+            latest_match_date = match_date
+        team1_name = api_clean_team_name(match["home_name"])
+        team2_name = api_clean_team_name(match["away_name"])
         match_datetime = datetime.strptime(
             f"{match['date']} {match['scheduled']}", "%Y-%m-%d %H:%M"
         )
         match_datetime += timedelta(hours=2)  # Convert to UTC
-        db_game = (
-            db.query(Game)
-            .filter(
-                and_(
-                    Game.team1 == team1,
-                    Game.team2 == team2,
-                    Game.match_time == match_datetime,
-                )
+        team1_score, team2_score = parse_api_score(match["ft_score"])
+        if match["outcomes"]["penalty_shootout"]:
+            penalty_score_team1, penalty_score_team2 = parse_api_score(
+                match.get("ps_score")
             )
-            .first()
-        )
+        else:
+            penalty_score_team1, penalty_score_team2 = None, None
+        game_winner = match["outcomes"]["full_time"]
+
+        key = game_key(team1_name, team2_name, match_datetime)
+        db_game = game_index.get(key)
         if db_game:
             if db_game.game_state == GameState.upcoming:
-                score_match = re.search(r"(\d+)\s*-\s*(\d+)", score)
-                if score_match:
-                    db_game.score_team1, db_game.score_team2 = map(
-                        int, score_match.groups()
-                    )
-                db_game.game_winner = match["outcomes"]["full_time"]
-                db.commit()  # Make sure to commit changes
-                continue  # Skip the rest of the loop after updating
-            else:
-                continue  # Skip the rest of the loop if the game is already in the database
-        stadium = match["location"]
-
-        score_match = re.search(r"(\d+)\s*-\s*(\d+)", score)
-        if score_match:
-            team1_score, team2_score = map(int, score_match.groups())
-        else:
-            team1_score, team2_score = None, None
+                if team1_score is not None:
+                    db_game.score_team1, db_game.score_team2 = team1_score, team2_score
+                db_game.penalty_score_team1 = penalty_score_team1
+                db_game.penalty_score_team2 = penalty_score_team2
+                db_game.game_winner = game_winner
+                updated_games += 1
+            continue  # Games that are already finished are left as they are
 
-        game_winner = match["outcomes"]["full_time"]
         odds = match["odds"]
         if odds:
             team1_odds = float(odds["pre"]["1"])
@@ -140,14 +210,13 @@ def fetch_history_games_from_api(db: Session):
             draw_odds = float(odds["pre"]["X"])
         else:
             team1_odds, team2_odds, draw_odds = 1, 1, 1
-        overtime = match["outcomes"]["penalty_shootout"]
-        if not overtime:
-            penalty_score_team1, penalty_score_team2 = None, None
         game = Game(
             team1=team1_name,
             team2=team2_name,
+            team1_id=team_ids.get(team1_name),
+            team2_id=team_ids.get(team2_name),
             match_time=match_datetime,
-            stadium=stadium,
+            stadium=match["location"],
             score_team1=team1_score,
             score_team2=team2_score,
             penalty_score_team1=penalty_score_team1,
@@ -158,68 +227,72 @@ def fetch_history_games_from_api(db: Session):
             draw_odds=draw_odds,
         )
         db.add(game)
-        added_games += 1
+        game_index[key] = game
+        added_games.append(game)
+
+    db.flush()
+    record_odds_snapshots(db, added_games)
+    if not matches.complete:
+        # ✅ Matches on the missing pages may be older than the overlap window,
+        # keep the watermark so the next run requests them again
+        print(f"History pages {sorted(matches.failed_pages)} failed, watermark kept")
+    elif latest_match_date:
+        advance_watermark(db, HISTORY_WATERMARK_SOURCE, latest_match_date)
+    print(f"History: {len(added_games)} games added, {updated_games} results updated")
 
 
-def fetch_fixtures_games_from_api(db: Session):
+def fetch_fixtures_games_from_api(
+    db: Session, game_index: Optional[dict[tuple, Game]] = None
+):
+    """Adds upcoming fixtures we don't have yet. The caller commits."""
+    if game_index is None:
+        game_index = load_game_index(db, datetime.utcnow() - GAME_INDEX_PADDING)
     fixtures = fetch_all_fixture_pages()
-    added_games = 0
+    team_ids = team_ids_by_name(db)
+    added_games = []
     for fixture in fixtures:
-        team1 = fixture["home"]["name"]
-        team1_name = api_clean_team_name(team1)
-        team2 = fixture["away"]["name"]
-        team2_name = api_clean_team_name(team2)
+        team1_name = api_clean_team_name(fixture["home"]["name"])
+        team2_name = api_clean_team_name(fixture["away"]["name"])
         match_datetime = datetime.strptime(
             f"{fixture['date']} {fixture['time']}", "%Y-%m-%d %H:%M:%S"
         )
         match_datetime += timedelta(hours=2)  # Convert to UTC
-        db_game = (
-            db.query(Game)
-            .filter(
-                and_(
-                    Game.team1 == team1,
-                    Game.team2 == team2,
-                    Game.match_time == match_datetime,
-                )
-            )
-            .first()
-        )
-        if db_game:
+        key = game_key(team1_name, team2_name, match_datetime)
+        if key in game_index:
             continue
-        stadium = fixture["location"]
-        team1_odds = (
-            float(fixture["odds"]["pre"]["1"])
-            if fixture["odds"]["pre"]["1"] is not None
-            else None
-        )
-        team2_odds = (
-            float(fixture["odds"]["pre"]["2"])
-            if fixture["odds"]["pre"]["2"] is not None
-            else None
-        )
-        draw_odds = (
-            float(fixture["odds"]["pre"]["X"])
-            if fixture["odds"]["pre"]["X"] is not None
-            else None
-        )
 
-        fixture = Game(
+        pre_odds = fixture["odds"]["pre"]
+        game = Game(
             team1=team1_name,
             team2=team2_name,
+            team1_id=team_ids.get(team1_name),
+            team2_id=team_ids.get(team2_name),
             match_time=match_datetime,
-            stadium=stadium,
-            team1_odds=team1_odds,
-            team2_odds=team2_odds,
-            draw_odds=draw_odds,
+            stadium=fixture["location"],
+            team1_odds=float(pre_odds["1"]) if pre_odds["1"] is not None else None,
+            team2_odds=float(pre_odds["2"]) if pre_odds["2"] is not None else None,
+            draw_odds=float(pre_odds["X"]) if pre_odds["X"] is not None else None,
         )
-        db.add(fixture)
-        added_games += 1
+        db.add(game)
+        game_index[key] = game
+        added_games.append(game)
+
+    db.flush()
+    record_odds_snapshots(db, added_games)
+    print(f"Fixtures: {len(added_games)} games added")
 
 
 def api_clean_team_name(team_name):
-    return settings.API_TEAM_MAPPING.get(team_name, team_name)
+    return canonical_team_name(team_name, "api")
 
 
 def fecth_and_process_games_data(db: Session):
-    fetch_history_games_from_api(db)
-    fetch_fixtures_games_from_api(db)
+    """
+    Syncs history and fixtures from the livescore API against one preloaded
+    index of the games in the ingestion window, and commits once.
+    """
+    since = datetime.fromisoformat(history_start_date(db)) - GAME_INDEX_PADDING
+    game_index = load_game_index(db, since)
+    fetch_history_games_from_api(db, game_index)
+    fetch_fixtures_games_from_api(db, game_index)
+    db.commit()
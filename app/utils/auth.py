@@ -1,14 +1,11 @@
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from app.config import settings
 from app.models.user import User
 from app.utils.database import get_db
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.utils.password_hashing import pwd_context
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -0,0 +1,91 @@
+import asyncio
+from app.utils.logger import get_logger
+
+logger = get_logger("broadcaster")
+
+# Sentinel pushed to a subscriber queue when the subscriber is dropped
+CLOSED = object()
+
+
+class Broadcaster:
+    """
+    Fans out messages to many asyncio subscribers from a single publisher.
+    `publish` is thread-safe, so sync code (ingestion, scheduled updates) can
+    push messages onto the event loop that serves the connections.
+    """
+
+    def __init__(self, name: str, queue_size: int = 100):
+        self.name = name
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._subscribers: set = set()
+        self._loop = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, message):
+        """
+        Publishes a message to every subscriber. Safe to call from any thread.
+        """
+        loop = self._loop
+        if not self._subscribers or loop is None or loop.is_closed():
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            self._fan_out(message)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, message)
+
+    def _fan_out(self, message):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # ✅ Slow consumer: drop it instead of buffering without bound
+                self._drop(queue)
+
+    def _drop(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(CLOSED)
+        self.dropped += 1
+        logger.warning(f"⚠️ Dropped slow {self.name} subscriber")
+
+    async def listen(self, initial=(), keepalive: float = None):
+        """
+        Subscribes and yields messages as they are published.
+        Yields the `initial` messages first, and `None` every `keepalive`
+        seconds without traffic so the caller can keep the connection alive.
+        """
+        queue = self.subscribe()
+        try:
+            for message in initial:
+                yield message
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if message is CLOSED:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(queue)
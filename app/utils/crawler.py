@@ -0,0 +1,212 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+from app.utils.http_cache import HttpCache
+from app.utils.http_client import (
+    RETRYABLE_STATUS_CODES,
+    circuit_breakers,
+    http_metrics,
+    status_error,
+)
+from app.utils.logger import get_logger
+from app.utils.replay import async_transport, is_replaying
+
+logger = get_logger("crawler")
+
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average, with bursts up to `capacity`.
+    Callers reserve a token and sleep off any debt, so one bucket can be shared
+    by crawls running on different event loops.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class AsyncCrawler:
+    """
+    Fetches pages concurrently on a shared httpx.AsyncClient.
+    Concurrency is bounded by a semaphore, every host is rate limited by its own
+    token bucket, and retries share one exponential backoff policy. Requests
+    feed the shared per-host metrics and circuit breakers of `http_client`.
+    """
+
+    def __init__(
+        self,
+        headers: Callable[[], dict] = dict,
+        max_concurrency: int = settings.CRAWLER_MAX_CONCURRENCY,
+        requests_per_minute: float = settings.CRAWLER_REQUESTS_PER_MINUTE,
+        burst: int = settings.CRAWLER_BURST,
+        max_retries: int = settings.CRAWLER_MAX_RETRIES,
+        base_delay: float = 3,
+        max_delay: float = 60,
+        timeout: float = settings.CRAWLER_TIMEOUT,
+        cache: Optional[HttpCache] = None,
+    ):
+        self.headers = headers
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.rate = requests_per_minute / 60
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        # ✅ Kept across crawls so back-to-back crawls share each host's limit
+        self._buckets: dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        delay = min(self.base_delay * 2**attempt, self.max_delay)
+        return delay + random.uniform(0, delay / 2)
+
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str,
+    ) -> Optional[bytes]:
+        bucket = self._bucket_for(url)
+        host = urlsplit(url).netloc
+        breaker = circuit_breakers.for_host(host)
+        for attempt in range(self.max_retries):
+            if not breaker.allow():
+                logger.warning(f"⛔ Circuit open for {host}, skipping {url}")
+                http_metrics.count_error(host, "circuit_open")
+                return None
+            headers = self.headers()
+            if self.cache:
+                headers.update(self.cache.conditional_headers(url))
+            if not is_replaying():
+                await bucket.acquire()
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url, headers=headers)
+                except httpx.HTTPError as e:
+                    error = (
+                        "timeout"
+                        if isinstance(e, httpx.TimeoutException)
+                        else "connection"
+                    )
+                    http_metrics.observe(host, time.perf_counter() - start, error)
+                    breaker.record_failure()
+                    delay = self._backoff(attempt)
+                    logger.error(f"Connection error: {e}. Retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+            http_metrics.observe(
+                host,
+                time.perf_counter() - start,
+                status_error(response.status_code),
+            )
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if response.status_code == 304 and self.cache:
+                cached = self.cache.hit(url)
+                if cached:
+                    return cached[0]
+                logger.error(f"Got 304 without a cached copy ({url})")
+                return None
+            if response.status_code == 200:
+                if self.cache:
+                    self.cache.store(url, response.headers, response.content)
+                return response.content
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                delay = self._backoff(attempt, response.headers.get("Retry-After"))
+                logger.warning(
+                    f"Request failed ({response.status_code}). Retrying in {delay:.1f} seconds..."
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            logger.error(f"Request failed: {response.status_code} ({url})")
+            return None
+
+        logger.error(f"Max retries exceeded for {url}")
+        return None
+
+    async def fetch_all(self, urls: list[str]) -> dict[str, Optional[bytes]]:
+        """Fetches every URL and returns the bodies by URL (None for failures)."""
+        unique_urls = list(dict.fromkeys(urls))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        start = time.perf_counter()
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=limits,
+            follow_redirects=True,
+            transport=async_transport(),
+        ) as client:
+            bodies = await asyncio.gather(
+                *(self._fetch(client, semaphore, url) for url in unique_urls)
+            )
+        logger.info(
+            f"🕸️ Crawled {len(unique_urls)} pages in {time.perf_counter() - start:.1f}s"
+        )
+        if self.cache:
+            logger.info(f"♻️ HTTP cache: {self.cache.stats()}")
+        return dict(zip(unique_urls, bodies))
+
+    def crawl(self, urls: list[str]) -> dict[str, Optional[bytes]]:
+        """Sync entry point for `fetch_all`."""
+        return run_sync(self.fetch_all(urls))
+
+    def fetch_page(self, url: str) -> Optional[bytes]:
+        return self.crawl([url])[url]
+
+
+def run_sync(coroutine):
+    """
+    Runs a coroutine to completion from sync code.
+    When called from a thread that already runs an event loop (e.g. a sync
+    startup handler), the coroutine runs on a fresh loop in a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
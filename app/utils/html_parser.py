@@ -0,0 +1,126 @@
+import re
+from typing import NamedTuple, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("html_parser")
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Fastest first; "html.parser" is pure Python and always available
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+TableId = Union[str, re.Pattern]
+
+
+class TableRow(NamedTuple):
+    cells: list[str]  # Stripped text of every th/td cell
+    links: list[Optional[str]]  # href of the first link in every cell
+
+
+def available_backends() -> list[str]:
+    available = {
+        "selectolax": LexborHTMLParser is not None,
+        "lxml": LXML_AVAILABLE,
+        "html.parser": True,
+    }
+    return [backend for backend in BACKENDS if available[backend]]
+
+
+def resolve_backend(backend: str = None) -> str:
+    backend = backend or settings.HTML_PARSER_BACKEND
+    available = available_backends()
+    if backend == "auto":
+        return available[0]
+    if backend not in available:
+        logger.warning(f"⚠️ HTML parser {backend} unavailable, using html.parser")
+        return "html.parser"
+    return backend
+
+
+def _matches(table_id: TableId, value: Optional[str]) -> bool:
+    if value is None:
+        return False
+    if isinstance(table_id, re.Pattern):
+        return bool(table_id.search(value))
+    return value == table_id
+
+
+def _parse_with_selectolax(content, table_id: TableId) -> Optional[list[TableRow]]:
+    tree = LexborHTMLParser(content)
+    table = next(
+        (
+            node
+            for node in tree.css("table[id]")
+            if _matches(table_id, node.attributes.get("id"))
+        ),
+        None,
+    )
+    if table is None:
+        return None
+
+    rows = []
+    for row in table.css("tr"):
+        cells = [node for node in row.iter() if node.tag in ("th", "td")]
+        rows.append(
+            TableRow(
+                cells=[
+                    cell.text(deep=True, separator="", strip=True) for cell in cells
+                ],
+                links=[
+                    link.attributes.get("href") if link else None
+                    for link in (cell.css_first("a") for cell in cells)
+                ],
+            )
+        )
+    return rows
+
+
+def _parse_with_soup(
+    content, table_id: TableId, parser: str
+) -> Optional[list[TableRow]]:
+    # ✅ Only the target table is turned into a tree, the rest is skipped
+    strainer = SoupStrainer("table", id=table_id)
+    table = BeautifulSoup(content, parser, parse_only=strainer).find("table")
+    if table is None:
+        return None
+
+    rows = []
+    for row in table.find_all("tr"):
+        cells = row.find_all(["th", "td"])
+        rows.append(
+            TableRow(
+                cells=[cell.get_text(strip=True) for cell in cells],
+                links=[
+                    link.get("href") if link else None
+                    for link in (cell.find("a") for cell in cells)
+                ],
+            )
+        )
+    return rows
+
+
+def parse_table(
+    content, table_id: TableId, backend: str = None
+) -> Optional[list[TableRow]]:
+    """
+    Parses only the table whose id equals `table_id` (or matches it, for a
+    compiled pattern) and returns its rows. Returns None if there's no such table.
+    """
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        return _parse_with_selectolax(content, table_id)
+    return _parse_with_soup(content, table_id, backend)
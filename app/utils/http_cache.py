@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("http_cache")
+
+
+class HttpCache:
+    """
+    Persistent conditional-request cache keyed by URL.
+    Bodies are stored gzip-compressed next to their ETag / Last-Modified
+    validators; a 304 answer to a conditional request is a cache hit.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body.gz"
+
+    def _read_meta(self, url: str) -> Optional[dict]:
+        meta_path, body_path = self._paths(url)
+        if not self.enabled or not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            return json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url: str) -> dict:
+        """Returns If-None-Match / If-Modified-Since headers for a cached URL."""
+        meta = self._read_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def hit(self, url: str) -> Optional[tuple[bytes, dict]]:
+        """Loads the cached body and headers after a 304 response."""
+        meta = self._read_meta(url)
+        if not meta:
+            return None
+        _, body_path = self._paths(url)
+        try:
+            body = gzip.decompress(body_path.read_bytes())
+        except OSError:
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(body)
+        return body, meta.get("headers", {})
+
+    def store(self, url: str, headers, body: bytes):
+        """Stores a 200 response. Responses without validators are only counted."""
+        with self._lock:
+            self.misses += 1
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not self.enabled or not (etag or last_modified):
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {
+                "Content-Type": headers.get("Content-Type", ""),
+            },
+            "size": len(body),
+            "stored_at": datetime.utcnow().isoformat(),
+        }
+        # ✅ Write to temp files first so a crash never leaves a torn entry
+        for path, data in (
+            (body_path, gzip.compress(body, mtime=0)),
+            (meta_path, json.dumps(meta).encode()),
+        ):
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / requests, 3) if requests else 0.0,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+http_cache = HttpCache(settings.HTTP_CACHE_DIR, enabled=settings.HTTP_CACHE_ENABLED)
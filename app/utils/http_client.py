@@ -0,0 +1,269 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+from app.utils.http_cache import HttpCache
+from app.utils.logger import get_logger
+from app.utils.replay import configure_session
+
+logger = get_logger("http_client")
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors: dict[str, int] = {}
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_sum_ms = 0.0
+
+    def snapshot(self) -> dict:
+        bounds = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "latency_ms": dict(zip(bounds, self.latency_buckets)),
+            "mean_latency_ms": (
+                round(self.latency_sum_ms / self.requests, 1) if self.requests else 0.0
+            ),
+        }
+
+
+class HttpMetrics:
+    """Per-host request counts, error counts by kind and latency histograms."""
+
+    def __init__(self):
+        self._hosts: dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, host: str, seconds: float, error: Optional[str] = None):
+        latency_ms = seconds * 1000
+        with self._lock:
+            metrics = self._hosts.setdefault(host, HostMetrics())
+            metrics.requests += 1
+            metrics.latency_sum_ms += latency_ms
+            metrics.latency_buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+            if error:
+                metrics.errors[error] = metrics.errors.get(error, 0) + 1
+
+    def count_error(self, host: str, error: str):
+        """Counts an error for a request that was never sent (e.g. an open circuit)."""
+        with self._lock:
+            metrics = self._hosts.setdefault(host, HostMetrics())
+            metrics.errors[error] = metrics.errors.get(error, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {host: metrics.snapshot() for host, metrics in self._hosts.items()}
+
+
+def status_error(status_code: int) -> Optional[str]:
+    """Error kind of a response status, or None for a success."""
+    if status_code >= 500:
+        return "5xx"
+    if status_code == 429:
+        return "429"
+    if status_code >= 400:
+        return "4xx"
+    return None
+
+
+class CircuitBreaker:
+    """
+    Stops calling a host after `failure_threshold` consecutive failures.
+    After `reset_timeout` seconds requests are let through again; the first
+    success closes the circuit and a failure opens it for another period.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """One circuit breaker per host, created on first use."""
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.HTTP_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = settings.HTTP_CIRCUIT_RESET_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout
+                )
+            return self._breakers[host]
+
+    def states(self) -> dict[str, str]:
+        with self._lock:
+            return {host: breaker.state for host, breaker in self._breakers.items()}
+
+
+http_metrics = HttpMetrics()
+circuit_breakers = CircuitBreakers()
+
+
+def cached_response(url: str, body: bytes, headers: dict) -> requests.Response:
+    """Builds a 200 response from a cached body after a 304."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.headers.update(headers)
+    response.from_cache = True
+    return response
+
+
+class HttpClient:
+    """
+    Shared blocking HTTP client for every outbound call: one pooled keep-alive
+    session, default timeouts, retries with exponential backoff and full jitter,
+    a circuit breaker per host and per-host latency / error metrics.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = settings.HTTP_POOL_SIZE,
+        timeout: float = settings.HTTP_TIMEOUT,
+        max_retries: int = settings.HTTP_MAX_RETRIES,
+        base_delay: float = 1,
+        max_delay: float = 30,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        configure_session(self.session)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.base_delay * 2**attempt, self.max_delay))
+
+    def get(
+        self,
+        url: str,
+        params: dict = None,
+        headers: dict = None,
+        timeout: float = None,
+        cache: Optional[HttpCache] = None,
+    ) -> Optional[requests.Response]:
+        """
+        GETs a URL and returns the final response, including non-retryable
+        error statuses. Returns None if the host's circuit is open or every
+        attempt failed. With a `cache`, requests are conditional and a 304 is
+        answered from the cached copy.
+        """
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        host = urlsplit(full_url).netloc
+        breaker = circuit_breakers.for_host(host)
+
+        for attempt in range(self.max_retries):
+            if not breaker.allow():
+                logger.warning(f"⛔ Circuit open for {host}, skipping {url}")
+                http_metrics.count_error(host, "circuit_open")
+                return None
+
+            request_headers = dict(headers or {})
+            if cache:
+                request_headers.update(cache.conditional_headers(full_url))
+            start = time.perf_counter()
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    headers=request_headers,
+                    timeout=timeout or self.timeout,
+                )
+            except requests.exceptions.RequestException as e:
+                error = (
+                    "timeout"
+                    if isinstance(e, requests.exceptions.Timeout)
+                    else "connection"
+                )
+                http_metrics.observe(host, time.perf_counter() - start, error)
+                breaker.record_failure()
+                delay = self._backoff(attempt)
+                logger.error(f"Connection error: {e}. Retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            http_metrics.observe(
+                host,
+                time.perf_counter() - start,
+                status_error(response.status_code),
+            )
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if response.status_code == 304 and cache:
+                cached = cache.hit(full_url)
+                if cached:
+                    logger.info(f"♻️ Not modified, using cached copy of {url}")
+                    return cached_response(full_url, *cached)
+                logger.error(f"Got 304 without a cached copy ({url})")
+                return None
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                delay = self._backoff(attempt, response.headers.get("Retry-After"))
+                logger.warning(
+                    f"Request failed ({response.status_code}). Retrying in {delay:.1f} seconds..."
+                )
+                time.sleep(delay)
+                continue
+            if response.status_code == 200 and cache:
+                cache.store(full_url, response.headers, response.content)
+            return response
+
+        logger.error(f"Max retries exceeded for {url}")
+        return None
+
+
+http_client = HttpClient()
@@ -0,0 +1,142 @@
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import re
+import stat
+from functools import lru_cache
+from pathlib import Path
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("logo_assets")
+
+MANIFEST_NAME = "manifest.json"
+DEFAULT_LOGO = "default_logo"
+FORMATS = ("png", "webp")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Matches "<name>-<size>.<12 hex chars>.<ext>" as written by build_logo_assets
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.\w+(\.gz)?$")
+# Only keep a gzip variant when it saves at least this fraction of the size
+MIN_GZIP_SAVING = 0.1
+
+
+def _write_if_missing(path: Path, data: bytes):
+    if not path.exists():
+        path.write_bytes(data)
+
+
+def build_logo_assets(
+    source_dir: str = settings.LOGO_SOURCE_DIR,
+    build_dir: str = settings.LOGO_BUILD_DIR,
+) -> dict:
+    """
+    Resizes every source logo to `settings.LOGO_SIZES` in PNG and WebP with
+    content-hashed file names, and writes the manifest the serializers read.
+    Gzip variants are emitted next to files that actually compress.
+    """
+    from PIL import Image
+
+    build_path = Path(build_dir)
+    build_path.mkdir(parents=True, exist_ok=True)
+
+    assets = {}
+    for source in sorted(Path(source_dir).glob("*.png")):
+        slug = source.stem.replace(" ", "_")
+        with Image.open(source) as image:
+            image = image.convert("RGBA")
+            entry = {}
+            for size in settings.LOGO_SIZES:
+                resized = image.copy()
+                resized.thumbnail((size, size), Image.LANCZOS)
+                entry[str(size)] = {}
+                for fmt in FORMATS:
+                    buffer = io.BytesIO()
+                    if fmt == "webp":
+                        resized.save(buffer, format="WEBP", quality=85, method=6)
+                    else:
+                        resized.save(buffer, format="PNG", optimize=True)
+                    data = buffer.getvalue()
+                    digest = hashlib.sha256(data).hexdigest()[:12]
+                    filename = f"{slug}-{size}.{digest}.{fmt}"
+                    _write_if_missing(build_path / filename, data)
+
+                    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+                    if len(compressed) <= len(data) * (1 - MIN_GZIP_SAVING):
+                        _write_if_missing(build_path / f"{filename}.gz", compressed)
+
+                    entry[str(size)][fmt] = filename
+        assets[source.stem] = entry
+
+    manifest = {"sizes": settings.LOGO_SIZES, "assets": assets}
+    (build_path / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    load_manifest.cache_clear()
+
+    logger.info(f"✅ Built {len(assets)} team logos into {build_path}")
+    return manifest
+
+
+@lru_cache(maxsize=1)
+def load_manifest() -> dict:
+    manifest_path = Path(settings.LOGO_BUILD_DIR) / MANIFEST_NAME
+    if not manifest_path.exists():
+        logger.warning(
+            "⚠️ Logo manifest not found. Run `python -m app.utils.logo_assets`"
+        )
+        return {"sizes": [], "assets": {}}
+    return json.loads(manifest_path.read_text())
+
+
+def team_logo_url(team_name: str, size: int = None, fmt: str = "png") -> str:
+    """
+    Returns the hashed logo URL of a team, falling back to the default logo.
+    Returns None when the logos haven't been built.
+    """
+    assets = load_manifest()["assets"]
+    stem = settings.TEAM_LOGO_FILES.get(team_name, (team_name or "").replace(" ", "_"))
+    entry = assets.get(stem) or assets.get(DEFAULT_LOGO)
+    if not entry:
+        return None
+    variant = entry.get(str(size or settings.LOGO_DEFAULT_SIZE))
+    if not variant:
+        return None
+    return settings.LOGO_URL_PREFIX + variant[fmt]
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    Serves content-hashed files with a far-future immutable Cache-Control,
+    and their precompressed `.gz` variant when the client accepts gzip.
+    """
+
+    async def get_response(self, path: str, scope) -> FileResponse:
+        if "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            full_path, stat_result = await anyio.to_thread.run_sync(
+                self.lookup_path, f"{path}.gz"
+            )
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                response = FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    media_type=mimetypes.guess_type(path)[0],
+                )
+                response.headers["Content-Encoding"] = "gzip"
+                response.headers["Vary"] = "Accept-Encoding"
+                response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+                return response
+
+        response = await super().get_response(path, scope)
+        if HASHED_NAME.search(path):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+if __name__ == "__main__":
+    build_logo_assets()
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("replay")
+
+# Credentials are never written to the corpus nor used to match requests
+SECRET_PARAMS = {"key", "secret", "apiKey", "api_key"}
+INDEX_NAME = "index.json"
+
+
+def request_key(url: str) -> str:
+    """Normalizes a URL into a corpus key: secrets dropped, params sorted."""
+    parts = urlsplit(url)
+    params = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query)
+        if name not in SECRET_PARAMS
+    )
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), ""))
+
+
+def fallback_key(url: str) -> str:
+    """Looser key used when there's no exact match: path and page number only."""
+    parts = urlsplit(url)
+    page = dict(parse_qsl(parts.query)).get("page")
+    return (
+        f"{parts.netloc}{parts.path}?page={page}" if page else parts.netloc + parts.path
+    )
+
+
+class Corpus:
+    """
+    Recorded HTTP responses on disk, indexed by normalized request URL.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._index = None
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            index_path = self.directory / INDEX_NAME
+            self._index = (
+                json.loads(index_path.read_text()) if index_path.exists() else {}
+            )
+        return self._index
+
+    def lookup(self, url: str) -> Optional[tuple[int, dict, bytes]]:
+        key = request_key(url)
+        entry = self.index.get(key)
+        if entry is None:
+            loose_key = fallback_key(url)
+            entry = next(
+                (
+                    candidate
+                    for candidate_key, candidate in self.index.items()
+                    if fallback_key(candidate_key) == loose_key
+                ),
+                None,
+            )
+        if entry is None:
+            return None
+        body = (self.directory / entry["file"]).read_bytes()
+        return entry["status"], {"Content-Type": entry["content_type"]}, body
+
+    def record(self, url: str, status: int, content_type: str, body: bytes):
+        key = request_key(url)
+        extension = "json" if "json" in content_type else "html"
+        filename = f"{hashlib.sha1(key.encode()).hexdigest()[:16]}.{extension}"
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if extension == "json" and not body.endswith(b"\n"):
+                body += b"\n"  # ✅ End-of-file newline, as pre-commit expects
+            (self.directory / filename).write_bytes(body)
+            self.index[key] = {
+                "file": filename,
+                "status": status,
+                "content_type": content_type,
+            }
+            (self.directory / INDEX_NAME).write_text(
+                json.dumps(self.index, indent=2, sort_keys=True) + "\n"
+            )
+        logger.info(f"📼 Recorded {key}")
+
+
+corpus = Corpus(settings.HTTP_REPLAY_DIR)
+
+
+def replay_delay() -> float:
+    return settings.HTTP_REPLAY_LATENCY_MS / 1000
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests adapter answering every request from the corpus."""
+
+    def send(self, request, **kwargs):
+        time.sleep(replay_delay())
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        recorded = corpus.lookup(request.url)
+        if recorded is None:
+            logger.warning(f"⚠️ No recorded response for {request_key(request.url)}")
+            response.status_code = 404
+            response._content = b""
+            return response
+        response.status_code, headers, response._content = recorded
+        response.headers.update(headers)
+        response.encoding = "utf-8"
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """requests adapter that records every successful response into the corpus."""
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            corpus.record(
+                request.url,
+                response.status_code,
+                response.headers.get("Content-Type", ""),
+                response.content,
+            )
+        return response
+
+
+async def _replay_handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(replay_delay())
+    recorded = corpus.lookup(str(request.url))
+    if recorded is None:
+        logger.warning(f"⚠️ No recorded response for {request_key(str(request.url))}")
+        return httpx.Response(404)
+    status, headers, body = recorded
+    return httpx.Response(status, headers=headers, content=body)
+
+
+class RecordingTransport(httpx.AsyncHTTPTransport):
+    """httpx transport that records every successful response into the corpus."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await super().handle_async_request(request)
+        if response.status_code == 200:
+            body = await response.aread()
+            corpus.record(
+                str(request.url),
+                response.status_code,
+                response.headers.get("Content-Type", ""),
+                body,
+            )
+        return response
+
+
+def is_replaying() -> bool:
+    return settings.HTTP_REPLAY_MODE == "replay"
+
+
+def configure_session(session: requests.Session) -> requests.Session:
+    """Mounts the replay or recording adapter on a session, per HTTP_REPLAY_MODE."""
+    if settings.HTTP_REPLAY_MODE == "replay":
+        adapter = ReplayAdapter()
+    elif settings.HTTP_REPLAY_MODE == "record":
+        adapter = RecordingAdapter()
+    else:
+        return session
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def async_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """Returns the httpx transport for HTTP_REPLAY_MODE, or None for the default."""
+    if settings.HTTP_REPLAY_MODE == "replay":
+        return httpx.MockTransport(_replay_handler)
+    if settings.HTTP_REPLAY_MODE == "record":
+        return RecordingTransport()
+    return None
@@ -1,17 +1,29 @@
-import requests
 import random
 import time
 import re
-from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, NamedTuple, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from sqlalchemy.sql import text
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.game import Game
 from app.models.team import Team
 from app.models.player import Player
+from app.schemas.game import GameState
 from app.utils.logger import get_logger
 from app.config import settings
+from app.services.odds_history import record_odds_snapshots
+from app.services.scrape_state import detect_changes, save_state
+from app.services.team_aliases import (
+    canonical_team_name,
+    link_game_teams,
+    team_ids_by_name,
+)
+from app.utils.api_helper import api_clean_team_name
+from app.utils.team_names import normalize_team_key
+from app.utils.crawler import AsyncCrawler
+from app.utils.http_cache import http_cache
+from app.utils.html_parser import parse_table
+from app.utils.http_client import http_client
 import unicodedata
 
 logger = get_logger("scraper")
@@ -25,8 +37,8 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/92.0.902.67",
 ]
 
-# Persistent session to maintain cookies & headers
-session = requests.Session()
+# Slack around the odds feed's kickoff times when loading games to match against
+ODDS_MATCH_WINDOW_PADDING = timedelta(days=1)
 
 # Custom headers to reduce bot detection
 DEFAULT_HEADERS = {
@@ -39,231 +51,223 @@ DEFAULT_HEADERS = {
 }
 
 
-def make_request(url, max_retries=5, base_delay=3, max_delay=30):
-    """Enhanced request with detailed logging for debugging."""
-    delay = base_delay
-    for attempt in range(max_retries):
-        headers = {**DEFAULT_HEADERS, "User-Agent": random.choice(USER_AGENTS)}
-        try:
-            response = session.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                return response
-            elif response.status_code == 429:
-                delay_with_jitter = delay + random.uniform(1, 3)
-                logger.warning(
-                    f"Rate limited (429). Retrying in {delay_with_jitter:.1f} seconds..."
-                )
-                time.sleep(delay_with_jitter)
-                delay = min(delay * 2, max_delay)
-            else:
-                logger.error(f"Request failed: {response.status_code} ({url})")
-                return None
+def random_headers():
+    return {**DEFAULT_HEADERS, "User-Agent": random.choice(USER_AGENTS)}
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Connection error: {e}")
-            time.sleep(delay)
-            delay = min(delay * 2, max_delay)
 
-    logger.error(f"Max retries exceeded for {url}")
-    return None
+# Shared rate-limited crawler for FBRef pages
+crawler = AsyncCrawler(headers=random_headers, cache=http_cache)
 
 
-import re
+class MatchRecord(NamedTuple):
+    """A single row of the FBRef schedule table."""
 
+    date: str
+    match_time: datetime
+    team1: str
+    team2: str
+    score_team1: Optional[int]
+    score_team2: Optional[int]
+    penalty_score_team1: Optional[int]
+    penalty_score_team2: Optional[int]
 
-def fetch_games_from_web(db: Session, target_date: str = None):
-    """
-    Fetches all games (or games from a specific date) from FBRef and stores them in the database.
-    """
-    logger.info(
-        f"🔍 Fetching matches from FBRef for {target_date if target_date else 'all upcoming dates'}"
-    )
+    @property
+    def key(self):
+        return self.team1, self.team2, self.match_time
 
-    response = make_request(settings.CL_GAMES_SCRAPING_URL)
-    if not response:
-        return
 
-    soup = BeautifulSoup(response.content, "html.parser")
-    games_table = soup.find("table", {"id": "sched_all"})
-    if not games_table:
+PLAYERS_TABLE_ID = re.compile(r"^stats_standard_\d+$")
+# scrape_state keys of the teams table and of every team's players table
+TEAMS_STATE_KEY = "fbref:teams"
+PLAYERS_STATE_KEY_PREFIX = "fbref:players:"
+SCORE_PATTERN = re.compile(r"(\d+)–(\d+)")
+PENALTY_PATTERN = re.compile(r"\((\d+)\)")
+
+
+def parse_schedule(content: bytes, target_date: str = None) -> Iterator[MatchRecord]:
+    """
+    Parses the `sched_all` table into match records, one row at a time.
+    """
+    rows = parse_table(content, "sched_all")
+    if not rows:
         logger.error("❌ No matches found on the page")
         return
 
-    added_games = 0
-    for row in games_table.find_all("tr"):
-        cells = row.find_all(["th", "td"])
-        if len(cells) > 1:
-            stage = cells[0].get_text(strip=True)
-            gameday = cells[1].get_text(strip=True) or None
-            date = cells[3].get_text(strip=True)
-            start_time = cells[4].get_text(strip=True)
-            team1 = clean_team_name(cells[5].get_text(strip=True))
-            team2 = clean_team_name(cells[9].get_text(strip=True))
-            score_text = cells[7].get_text(strip=True)
-
-            # Extract the main score (ignoring penalties)
-            score_match = re.search(r"(\d+)–(\d+)", score_text)
-            if score_match:
-                team1_score, team2_score = map(int, score_match.groups())
-            else:
-                team1_score, team2_score = None, None
-
-            # Extract penalty scores if available
-            penalty_match = re.findall(r"\((\d+)\)", score_text)
-            if len(penalty_match) == 2:
-                penalty_team1, penalty_team2 = map(int, penalty_match)
-            else:
-                penalty_team1, penalty_team2 = None, None
-
-            if target_date and date != target_date:
-                continue
+    for row in rows:
+        cells = row.cells
+        if len(cells) <= 9:
+            continue
 
-            try:
-                match_datetime = datetime.strptime(
-                    f"{date} {start_time}", "%Y-%m-%d %H:%M"
-                )
-            except ValueError:
-                logger.warning(
-                    f"⚠️ Skipping match with invalid date/time: {team1} vs {team2}"
-                )
-                continue
+        date = cells[3]
+        if target_date and date != target_date:
+            continue
 
-            db_game = (
-                db.query(Game)
-                .filter(
-                    and_(
-                        Game.team1 == team1,
-                        Game.team2 == team2,
-                        Game.match_time == match_datetime,
-                    )
-                )
-                .first()
+        start_time = cells[4]
+        team1 = clean_team_name(cells[5])
+        team2 = clean_team_name(cells[9])
+        score_text = cells[7]
+
+        try:
+            match_datetime = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %H:%M")
+        except ValueError:
+            logger.warning(
+                f"⚠️ Skipping match with invalid date/time: {team1} vs {team2}"
             )
-            if db_game:
-                continue
+            continue
+
+        # Extract the main score (ignoring penalties)
+        score_match = SCORE_PATTERN.search(score_text)
+        if score_match:
+            score_team1, score_team2 = map(int, score_match.groups())
+        else:
+            score_team1, score_team2 = None, None
+
+        # Extract penalty scores if available
+        penalty_match = PENALTY_PATTERN.findall(score_text)
+        if len(penalty_match) == 2:
+            penalty_team1, penalty_team2 = map(int, penalty_match)
+        else:
+            penalty_team1, penalty_team2 = None, None
+
+        yield MatchRecord(
+            date=date,
+            match_time=match_datetime,
+            team1=team1,
+            team2=team2,
+            score_team1=score_team1,
+            score_team2=score_team2,
+            penalty_score_team1=penalty_team1,
+            penalty_score_team2=penalty_team2,
+        )
 
+
+def fetch_schedule(target_date: str = None) -> Iterator[MatchRecord]:
+    """
+    Downloads the FBRef schedule page once and streams its match records.
+    """
+    logger.info(
+        f"🔍 Fetching matches from FBRef for {target_date if target_date else 'all dates'}"
+    )
+    content = crawler.fetch_page(settings.CL_GAMES_SCRAPING_URL)
+    if not content:
+        return iter(())
+    return parse_schedule(content, target_date)
+
+
+def apply_schedule(
+    db: Session,
+    records: Iterable[MatchRecord],
+    add_new: bool = True,
+    update_scores: bool = True,
+) -> tuple[int, int]:
+    """
+    Consumes match records: inserts games we don't have yet and/or updates the
+    scores of the ones we do. Existing games are loaded once up front.
+    Returns the number of (added, updated) games.
+    """
+    games_by_key = {
+        (game.team1, game.team2, game.match_time): game for game in db.query(Game).all()
+    }
+    team_ids = team_ids_by_name(db)
+
+    added_games, updated_games = 0, 0
+    for record in records:
+        game = games_by_key.get(record.key)
+        scores = {
+            "score_team1": record.score_team1,
+            "score_team2": record.score_team2,
+            "penalty_score_team1": record.penalty_score_team1,
+            "penalty_score_team2": record.penalty_score_team2,
+        }
+
+        if not game:
+            if not add_new:
+                continue
             game = Game(
-                team1=team1,
-                team2=team2,
-                match_time=match_datetime,
-                score_team1=team1_score,
-                score_team2=team2_score,
-                penalty_score_team1=penalty_team1,
-                penalty_score_team2=penalty_team2,
-                stage=stage,
-                gameday=gameday,
+                team1=record.team1,
+                team2=record.team2,
+                team1_id=team_ids.get(record.team1),
+                team2_id=team_ids.get(record.team2),
+                match_time=record.match_time,
+                **scores,
             )
             game.game_winner = game.determine_game_winner()
             db.add(game)
+            games_by_key[record.key] = game
             added_games += 1
             logger.info(
-                f"✅ Added {game.team1} {team1_score} - {team2_score} {game.team2} (Pens: {penalty_team1}-{penalty_team2})"
+                f"✅ Added {game.team1} {record.score_team1} - {record.score_team2} {game.team2} (Pens: {record.penalty_score_team1}-{record.penalty_score_team2})"
             )
+            continue
 
-        time.sleep(random.uniform(1, 3))  # ✅ Random delay
+        if not update_scores or all(
+            getattr(game, field) == value for field, value in scores.items()
+        ):
+            continue
+        for field, value in scores.items():
+            setattr(game, field, value)
+        game.game_winner = game.determine_game_winner()
+        updated_games += 1
+        logger.info(
+            f"✅ Updated score: {game.team1} {record.score_team1} - {record.score_team2} {game.team2} (Pens: {record.penalty_score_team1}-{record.penalty_score_team2})"
+        )
 
     db.commit()
-    logger.info(f"✅ {added_games} new matches added to the database")
+    return added_games, updated_games
 
 
-def update_scores_from_web(db: Session, target_date: str = None):
+def fetch_games_from_web(db: Session, target_date: str = None) -> int:
     """
-    Updates scores for matches (all or on a given date).
+    Fetches all games (or games from a specific date) from FBRef and stores them in the database.
     """
-    logger.info(
-        f"🔍 Updating match scores from FBRef for {target_date if target_date else 'all upcoming games'}"
+    added_games, _ = apply_schedule(
+        db, fetch_schedule(target_date), update_scores=False
     )
+    logger.info(f"✅ {added_games} new matches added to the database")
+    return added_games
 
-    response = make_request(settings.CL_GAMES_SCRAPING_URL)
-    if not response:
-        return
-
-    soup = BeautifulSoup(response.content, "html.parser")
-    games_table = soup.find("table", {"id": "sched_all"})
-    if not games_table:
-        logger.error("❌ No matches found on the page")
-        return
-
-    updated_count = 0
-    for row in games_table.find_all("tr"):
-        cells = row.find_all(["th", "td"])
-        if len(cells) > 1:
-            date = cells[3].get_text(strip=True)
-            start_time = cells[4].get_text(strip=True)
-            team1 = clean_team_name(cells[5].get_text(strip=True))
-            team2 = clean_team_name(cells[9].get_text(strip=True))
-            score_text = cells[7].get_text(strip=True)
-
-            if target_date and date != target_date:
-                continue
 
-            # Extract the main score
-            score_match = re.search(r"(\d+)–(\d+)", score_text)
-            if score_match:
-                score_team1, score_team2 = map(int, score_match.groups())
-            else:
-                score_team1, score_team2 = None, None
-
-            # Extract penalty scores if available
-            penalty_match = re.findall(r"\((\d+)\)", score_text)
-            if len(penalty_match) == 2:
-                penalty_team1, penalty_team2 = map(int, penalty_match)
-            else:
-                penalty_team1, penalty_team2 = None, None
-
-            try:
-                match_datetime = datetime.strptime(
-                    f"{date} {start_time}", "%Y-%m-%d %H:%M"
-                )
-            except ValueError:
-                logger.warning(
-                    f"⚠️ Skipping match with invalid date/time: {team1} vs {team2}"
-                )
-                continue
-
-            game = (
-                db.query(Game)
-                .filter(
-                    and_(
-                        Game.team1 == team1,
-                        Game.team2 == team2,
-                        Game.match_time == match_datetime,
-                    )
-                )
-                .first()
-            )
+def update_scores_from_web(db: Session, target_date: str = None) -> int:
+    """
+    Updates scores for matches (all or on a given date).
+    """
+    _, updated_games = apply_schedule(db, fetch_schedule(target_date), add_new=False)
+    logger.info(f"✅ Updated {updated_games} match scores")
+    return updated_games
 
-            if game:
-                game.score_team1 = score_team1
-                game.score_team2 = score_team2
-                game.penalty_score_team1 = penalty_team1
-                game.penalty_score_team2 = penalty_team2
-                game.game_winner = game.determine_game_winner()
-                db.add(game)
-                updated_count += 1
-                logger.info(
-                    f"✅ Updated score: {game.team1} {score_team1} - {score_team2} {game.team2} (Pens: {penalty_team1}-{penalty_team2})"
-                )
 
-    db.commit()
-    logger.info(f"✅ Updated {updated_count} match scores")
+def sync_schedule_from_web(db: Session, target_date: str = None) -> tuple[int, int]:
+    """
+    Adds new games and updates scores from a single download and parse of the schedule.
+    """
+    added_games, updated_games = apply_schedule(db, fetch_schedule(target_date))
+    logger.info(f"✅ {added_games} new matches added and {updated_games} scores updated")
+    return added_games, updated_games
 
 
 def fetch_betting_odds(db: Session):
     """
     Fetches the latest betting odds from the ODDS API.
+    Upcoming games in the feed's time window are loaded once and matched in memory
+    on normalized team names; all odds changes are written with one bulk update.
     """
     logger.info("🔍 Fetching betting odds from ODDS API")
 
     params = {
-        "api_key": settings.BETTING_ODDS_API_KEY,
+        "apiKey": settings.BETTING_ODDS_API_KEY,
         "regions": "eu",
         "markets": "h2h",
         "bookmakers": "unibet_eu",
     }
 
-    response = make_request(settings.BETTING_ODDS_API_URL)
-    if not response:
+    response = http_client.get(
+        settings.BETTING_ODDS_API_URL,
+        params=params,
+        headers=random_headers(),
+        cache=http_cache,
+    )
+    if response is None or response.status_code != 200:
+        logger.error("❌ Failed to fetch betting odds")
         return
 
     odds_data = response.json()
@@ -272,73 +276,134 @@ def fetch_betting_odds(db: Session):
         logger.info("⚠️ No betting odds found.")
         return
 
-    updated_games = 0
+    commence_times = [
+        datetime.strptime(event["commence_time"], "%Y-%m-%dT%H:%M:%SZ")
+        for event in odds_data
+        if event.get("commence_time")
+    ]
+    games_query = db.query(Game).filter(Game.game_state == GameState.upcoming)
+    if commence_times:
+        games_query = games_query.filter(
+            Game.match_time.between(
+                min(commence_times) - ODDS_MATCH_WINDOW_PADDING,
+                max(commence_times) + ODDS_MATCH_WINDOW_PADDING,
+            )
+        )
+    games_by_teams = {
+        (normalize_team_key(game.team1), normalize_team_key(game.team2)): game
+        for game in games_query.all()
+    }
+
+    updates = []
+    updated_games = []
+    unmatched_events = []
 
     for game_odds in odds_data:
+        event_start = time.perf_counter()
         home_team = game_odds["home_team"]
         away_team = game_odds["away_team"]
 
-        db_game = (
-            db.query(Game)
-            .filter((Game.team1 == home_team) & (Game.team2 == away_team))
-            .first()
+        db_game = games_by_teams.get(
+            (
+                normalize_team_key(api_clean_team_name(home_team)),
+                normalize_team_key(api_clean_team_name(away_team)),
+            )
         )
+        if not db_game:
+            unmatched_events.append(f"{home_team} vs {away_team}")
+            continue
+        if not game_odds["bookmakers"]:
+            continue
 
-        if db_game:
-            h2h_odds = game_odds["bookmakers"][0]["markets"][0]["outcomes"]
-            for outcome in h2h_odds:
-                if outcome["name"] == home_team:
-                    db_game.team1_odds = outcome["price"]
-                elif outcome["name"] == away_team:
-                    db_game.team2_odds = outcome["price"]
-                elif outcome["name"] == "Draw":
-                    db_game.draw_odds = outcome["price"]
-
-            updated_games += 1
-            db.add(db_game)
+        odds = {
+            "team1_odds": db_game.team1_odds,
+            "team2_odds": db_game.team2_odds,
+            "draw_odds": db_game.draw_odds,
+        }
+        h2h_odds = game_odds["bookmakers"][0]["markets"][0]["outcomes"]
+        for outcome in h2h_odds:
+            if outcome["name"] == home_team:
+                odds["team1_odds"] = outcome["price"]
+            elif outcome["name"] == away_team:
+                odds["team2_odds"] = outcome["price"]
+            elif outcome["name"] == "Draw":
+                odds["draw_odds"] = outcome["price"]
+
+        if any(getattr(db_game, key) != value for key, value in odds.items()):
+            updates.append({"id": db_game.id, **odds})
+            for key, value in odds.items():
+                # ✅ Keep the loaded object in sync without marking it dirty
+                set_committed_value(db_game, key, value)
+            updated_games.append(db_game)
+
+        logger.debug(
+            f"⏱️ Matched odds for {home_team} vs {away_team} in {(time.perf_counter() - event_start) * 1000:.2f}ms"
+        )
 
+    if updates:
+        db.bulk_update_mappings(Game, updates)
+    record_odds_snapshots(db, updated_games)
     db.commit()
-    logger.info(f"✅ Betting odds updated for {updated_games} games.")
+
+    if unmatched_events:
+        logger.warning(
+            f"⚠️ {len(unmatched_events)} odds events matched no game: {', '.join(unmatched_events)}"
+        )
+    logger.info(f"✅ Betting odds updated for {len(updated_games)} games.")
 
 
 ### **✅ Fetch Teams**
 def fetch_teams_from_web(db: Session):
     """
     Fetches all teams from FBRef and stores them in the database.
+    Skips the database entirely when the table hasn't changed since the last run.
     """
     logger.info(f"🔍 Fetching teams from FBRef")
-    response = make_request(settings.CL_GENERAL_SCRAPING_URL)
-    if not response:
+    content = crawler.fetch_page(settings.CL_GENERAL_SCRAPING_URL)
+    if not content:
         return
 
-    soup = BeautifulSoup(response.content, "html.parser")
-    teams_table = soup.find("table", {"id": "results2024-202582_overall"})
-    if not teams_table:
+    rows = parse_table(content, "results2024-202582_overall")
+    if not rows:
         logger.error("❌ No teams found on the page")
         return
 
-    added_teams = 0
-    for row in teams_table.find_all("tr"):
-        cells = row.find_all(["th", "td"])
+    scraped_teams = {}
+    for row in rows:
+        cells = row.cells
         if len(cells) < 10:
             continue
 
-        team_name = clean_team_name(cells[1].get_text(strip=True))
+        team_name = clean_team_name(cells[1])
         if team_name == "Squad":
             continue  # Skip the header row
+        scraped_teams[team_name] = row
+
+    changes = detect_changes(
+        db,
+        TEAMS_STATE_KEY,
+        {name: row.cells + [row.links[1]] for name, row in scraped_teams.items()},
+    )
+    if changes is None:
+        logger.info("✅ Teams table unchanged since the last run")
+        return
+
+    existing_teams = {
+        team.name: team
+        for team in db.query(Team).filter(Team.name.in_(changes.changed)).all()
+    }
+    added_teams, updated_teams = 0, 0
+    for team_name in changes.changed:
+        cells = scraped_teams[team_name].cells
         team_name_slug = team_name.replace(" ", "-")
-        points = (
-            int(cells[9].get_text(strip=True))
-            if cells[9].get_text(strip=True).isdigit()
-            else 0
-        )
+        points = int(cells[9]) if cells[9].isdigit() else 0
         team_href = ""
-        team_link = cells[1].find("a")
+        team_link = scraped_teams[team_name].links[1]
         champions_league_addon = "/2024-2025/c8"
         if team_link:
             team_href = (
                 settings.FBREF_BASE_URL
-                + team_link["href"].replace(
+                + team_link.replace(
                     f"/{team_name_slug}-Stats",
                     f"{champions_league_addon}/{team_name_slug}-Stats",
                 )
@@ -346,31 +411,22 @@ def fetch_teams_from_web(db: Session):
             )
         stats = {
             "League Phase": {
-                "matches_played": int(cells[2].get_text(strip=True))
-                if cells[2].get_text(strip=True).isdigit()
-                else 0,
-                "wins": int(cells[3].get_text(strip=True))
-                if cells[3].get_text(strip=True).isdigit()
-                else 0,
-                "draws": int(cells[4].get_text(strip=True))
-                if cells[4].get_text(strip=True).isdigit()
-                else 0,
-                "losses": int(cells[5].get_text(strip=True))
-                if cells[5].get_text(strip=True).isdigit()
-                else 0,
-                "goals_for": int(cells[6].get_text(strip=True))
-                if cells[6].get_text(strip=True).isdigit()
-                else 0,
-                "goals_against": int(cells[7].get_text(strip=True))
-                if cells[7].get_text(strip=True).isdigit()
-                else 0,
-                "goal_difference": int(cells[8].get_text(strip=True))
-                if cells[8].get_text(strip=True).isdigit()
-                else 0,
+                "matches_played": int(cells[2]) if cells[2].isdigit() else 0,
+                "wins": int(cells[3]) if cells[3].isdigit() else 0,
+                "draws": int(cells[4]) if cells[4].isdigit() else 0,
+                "losses": int(cells[5]) if cells[5].isdigit() else 0,
+                "goals_for": int(cells[6]) if cells[6].isdigit() else 0,
+                "goals_against": int(cells[7]) if cells[7].isdigit() else 0,
+                "goal_difference": int(cells[8]) if cells[8].isdigit() else 0,
             },
         }
-        db_team = db.query(Team).filter(Team.name == team_name).first()
+        db_team = existing_teams.get(team_name)
         if db_team:
+            db_team.points = points
+            db_team.stats = stats
+            db_team.webpage_url = team_href or db_team.webpage_url
+            updated_teams += 1
+            logger.info(f"✅ Updated team {team_name} with {points} points")
             continue
 
         new_team = Team(
@@ -385,104 +441,108 @@ def fetch_teams_from_web(db: Session):
         added_teams += 1
         logger.info(f"✅ Added team {new_team.name} with {new_team.points} points")
 
-        time.sleep(random.uniform(1, 3))  # ✅ Random delay
-
+    save_state(db, TEAMS_STATE_KEY, changes)
+    if added_teams:
+        db.flush()
+        link_game_teams(db)
     db.commit()
-    logger.info(f"✅ {added_teams} new teams added to the database")
+    logger.info(
+        f"✅ {added_teams} new teams added and {updated_teams} teams updated in the database"
+    )
 
 
 def fetch_players_from_web(db: Session):
     """
-    Fetches all players from FBRef and stores them in the database.
+    Fetches every team's players from FBRef and upserts them into the database.
+    Existing players are loaded once; new players and stat changes are written
+    in bulk. Teams whose players table hasn't changed since the last run are skipped.
     """
     logger.info(f"🔍 Fetching players from FBRef")
-    # teams = db.query(Team).all()
-    teams = (
-        db.query(Team)
-        .filter(text("jsonb_array_length(teams.players::jsonb) = 0"))
-        .all()
-    )
+    teams = db.query(Team).filter(Team.webpage_url != "").all()
     if not teams:
         logger.error("❌ No teams found in the database")
         return
 
-    added_players = 0
-
-    for team in teams:
-        if not team.webpage_url:
-            continue
+    logger.info(f"🔍 Fetching players pages for {len(teams)} teams")
+    pages = crawler.crawl([team.webpage_url for team in teams])
 
-        request_url = team.webpage_url
-        logger.info(f"🔍 Fetching players for {team.name} from {request_url}")
+    players_by_key = {
+        (team_id, name): (player_id, stats)
+        for player_id, team_id, name, stats in db.query(
+            Player.id, Player.team_id, Player.name, Player.stats
+        )
+    }
+    new_players, player_updates = [], []
+    unchanged_teams = 0
 
-        response = make_request(request_url)
-        if not response:
+    for team in teams:
+        content = pages.get(team.webpage_url)
+        if not content:
             continue
 
-        soup = BeautifulSoup(response.content, "html.parser")
-
         # ✅ Find table with any ID matching "stats_standard_{int}"
-        players_table = soup.find("table", id=re.compile(r"^stats_standard_\d+$"))
+        players_rows = parse_table(content, PLAYERS_TABLE_ID)
 
-        if not players_table:
+        if not players_rows:
             logger.error(f"❌ No players found for {team.name}")
             continue
 
         rows_to_skip = 2
-        team_players = []
+        scraped_players = {}
 
-        for row in players_table.find_all("tr"):
-            if len(team_players) >= 20:
+        for row in players_rows:
+            if len(scraped_players) >= 20:
                 break  # ✅ Stop after 20 players
-            cells = row.find_all(["th", "td"])
+            cells = row.cells
             if rows_to_skip > 0:
                 rows_to_skip -= 1
                 continue
 
-            player_name = unicodedata.normalize("NFC", cells[0].get_text(strip=True))
-            if player_name in team_players or player_name in [
+            player_name = unicodedata.normalize("NFC", cells[0])
+            if player_name in scraped_players or player_name in [
                 "Squad Total",
                 "Opponent Total",
             ]:
                 continue
 
-            team_players.append(player_name)  # ✅ Store player name instead of object
+            scraped_players[player_name] = cells
 
-            db_player = db.query(Player).filter(Player.name == player_name).first()
-            if db_player:
-                continue
+        state_key = f"{PLAYERS_STATE_KEY_PREFIX}{team.name}"
+        changes = detect_changes(db, state_key, scraped_players)
+        if changes is None:
+            unchanged_teams += 1
+            continue
 
+        for player_name in changes.changed:
+            cells = scraped_players[player_name]
             stats = {
-                "goals": int(cells[8].get_text(strip=True))
-                if cells[8].get_text(strip=True).isdigit()
-                else 0,
-                "assists": int(cells[9].get_text(strip=True))
-                if cells[9].get_text(strip=True).isdigit()
-                else 0,
-                "yellow_cards": int(cells[14].get_text(strip=True))
-                if cells[14].get_text(strip=True).isdigit()
-                else 0,
-                "red_cards": int(cells[15].get_text(strip=True))
-                if cells[15].get_text(strip=True).isdigit()
-                else 0,
+                "goals": int(cells[8]) if cells[8].isdigit() else 0,
+                "assists": int(cells[9]) if cells[9].isdigit() else 0,
+                "yellow_cards": int(cells[14]) if cells[14].isdigit() else 0,
+                "red_cards": int(cells[15]) if cells[15].isdigit() else 0,
             }
 
-            new_player = Player(
-                name=player_name,
-                team_id=team.id,
-                stats=stats,
-            )
-            db.add(new_player)
-            added_players += 1
-            logger.info(f"✅ Added player {new_player.name} to team {team.name}")
-
-        team.players = team_players
-        db.add(team)
-
-        time.sleep(random.uniform(1, 3))  # ✅ Random delay
-
+            existing = players_by_key.get((team.id, player_name))
+            if existing is None:
+                new_players.append(
+                    {"name": player_name, "team_id": team.id, "stats": stats}
+                )
+            elif existing[1] != stats:
+                player_updates.append({"id": existing[0], "stats": stats})
+
+        team_players = list(scraped_players)  # ✅ Store player names instead of objects
+        if team.players != team_players:
+            team.players = team_players
+        save_state(db, state_key, changes)
+
+    if new_players:
+        db.bulk_insert_mappings(Player, new_players)
+    if player_updates:
+        db.bulk_update_mappings(Player, player_updates)
     db.commit()
-    logger.info(f"✅ {added_players} new players added to the database")
+    logger.info(
+        f"✅ {len(new_players)} new players added and {len(player_updates)} updated, {unchanged_teams} teams unchanged"
+    )
 
 
 def clean_team_name(raw_name: str) -> str:
@@ -491,4 +551,4 @@ def clean_team_name(raw_name: str) -> str:
     :param raw_name: The extracted team name from the website.
     :return: The properly formatted team name.
     """
-    return settings.TEAM_NAME_MAPPING.get(raw_name, raw_name)
+    return canonical_team_name(raw_name, "fbref")
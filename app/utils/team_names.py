@@ -0,0 +1,15 @@
+import re
+import unicodedata
+
+
+def normalize_team_key(team_name: str) -> str:
+    """
+    Normalizes a team name for matching across sources:
+    strips accents, case and anything that isn't a letter or digit.
+    "Atlético Madrid" and "atletico-madrid" both become "atleticomadrid".
+    """
+    decomposed = unicodedata.normalize("NFKD", team_name or "")
+    without_accents = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    return re.sub(r"[^0-9a-z]", "", without_accents.casefold())
@@ -0,0 +1,71 @@
+"""
+Times every ingestion step against the recorded HTTP corpus.
+
+    python -m benchmarks.ingestion [--steps teams players schedule odds api] [--latency-ms 0]
+
+Runs in replay mode: FBRef pages and the livescore / odds APIs are answered from
+`HTTP_REPLAY_DIR` (benchmarks/corpus by default), so runs are deterministic
+and need no network or API keys. Writes go to the configured database, so point
+DATABASE_URL at a scratch database.
+Refresh the corpus against the live sources with HTTP_REPLAY_MODE=record.
+"""
+import argparse
+import os
+import time
+
+# Must be set before app modules read their settings
+os.environ.setdefault("HTTP_REPLAY_MODE", "replay")
+
+STEPS = ("teams", "players", "schedule", "odds", "api")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=list(STEPS))
+    parser.add_argument(
+        "--latency-ms", type=int, help="Simulated latency per replayed request"
+    )
+    args = parser.parse_args()
+
+    if args.latency_ms is not None:
+        os.environ["HTTP_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+
+    from app.config import settings
+    from app.services.team_aliases import seed_team_aliases
+    from app.utils.api_helper import fecth_and_process_games_data
+    from app.utils.database import session_local
+    from app.utils.scraper import (
+        fetch_betting_odds,
+        fetch_players_from_web,
+        fetch_teams_from_web,
+        sync_schedule_from_web,
+    )
+
+    steps = {
+        "teams": fetch_teams_from_web,
+        "players": fetch_players_from_web,
+        "schedule": sync_schedule_from_web,
+        "odds": fetch_betting_odds,
+        "api": fecth_and_process_games_data,
+    }
+
+    print(f"mode={settings.HTTP_REPLAY_MODE} corpus={settings.HTTP_REPLAY_DIR}")
+    print(f"{'step':<12} {'seconds':>10}")
+    total = 0.0
+    db = session_local()
+    try:
+        seed_team_aliases(db)
+        for name in args.steps:
+            start = time.perf_counter()
+            steps[name](db)
+            db.commit()
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            print(f"{name:<12} {elapsed:>10.3f}")
+    finally:
+        db.close()
+    print(f"{'total':<12} {total:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Measures password verification throughput of the login path.
+
+    python -m benchmarks.login_throughput [--logins 64] [--rounds 12] [--workers 1 2 4]
+
+Verifies `--logins` passwords concurrently, as a login burst would, through the
+password hashing process pool for each `--workers` count, and through the
+default threadpool (how login worked before) for comparison. Prints logins per
+second overall and per worker, and how late a 10 ms event loop tick ran while
+the burst was in flight. Needs no database.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+
+async def loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Worst delay of a periodic event loop tick while `stop` is unset, in ms."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst * 1000
+
+
+async def burst(verify, logins: int, password: str, hashed: str) -> tuple[float, float]:
+    stop = asyncio.Event()
+    lag = asyncio.create_task(loop_lag(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(verify(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return elapsed, await lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1})
+    )
+    args = parser.parse_args()
+
+    # Must be set before app modules read their settings
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_MAX_QUEUE"] = str(args.logins)
+
+    from app.utils.password_hashing import PasswordHasher, pwd_context
+
+    password = "Benchmark-Password-1"
+    hashed = pwd_context.hash(password)
+
+    async def threadpool_verify(password: str, hashed: str):
+        return await asyncio.to_thread(pwd_context.verify, password, hashed)
+
+    print(f"bcrypt rounds={args.rounds} logins={args.logins} cores={os.cpu_count()}")
+    print(
+        f"{'mode':<14} {'seconds':>8} {'logins/s':>9} {'per worker':>10} {'loop lag ms':>12}"
+    )
+
+    elapsed, lag = asyncio.run(burst(threadpool_verify, args.logins, password, hashed))
+    rate = args.logins / elapsed
+    print(f"{'threadpool':<14} {elapsed:>8.2f} {rate:>9.1f} {'':>10} {lag:>12.1f}")
+
+    for workers in args.workers:
+        hasher = PasswordHasher(workers=workers, max_queue=args.logins)
+        # Warm the pool up so process start-up is not timed
+        asyncio.run(burst(hasher.verify_and_update, workers, password, hashed))
+        elapsed, lag = asyncio.run(
+            burst(hasher.verify_and_update, args.logins, password, hashed)
+        )
+        hasher.shutdown()
+        rate = args.logins / elapsed
+        print(
+            f"{f'pool x{workers}':<14} {elapsed:>8.2f} {rate:>9.1f} "
+            f"{rate / workers:>10.1f} {lag:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
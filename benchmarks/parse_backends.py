@@ -0,0 +1,79 @@
+"""
+Benchmarks the HTML parser backends over saved FBRef pages.
+
+    python -m benchmarks.parse_backends [--table sched_all] [--repeat 5] [page.html ...]
+
+Reports the mean parse time and the peak traced memory of extracting one table
+with every available backend, next to the old full-tree BeautifulSoup parse.
+Peak memory comes from tracemalloc, so allocations made inside C parsers
+(lxml, selectolax) are only partially counted.
+Without pages, a synthetic page with the size and shape of an FBRef page is used.
+"""
+import argparse
+import re
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.utils.html_parser import available_backends, parse_table
+
+
+def full_tree_parse(content, table_id):
+    """The scraper's previous approach: build the whole tree, then find the table."""
+    return BeautifulSoup(content, "html.parser").find("table", id=table_id)
+
+
+def synthetic_page(rows: int = 100, filler_tables: int = 20) -> bytes:
+    row = "<tr>" + "".join(f"<td><a href='/x/{i}'>cell {i}</a></td>" for i in range(12))
+    table = "<table id='{}'><tbody>" + row * rows + "</tbody></table>"
+    filler = "".join(table.format(f"filler_{i}") for i in range(filler_tables))
+    return f"<html><body>{filler}{table.format('sched_all')}</body></html>".encode()
+
+
+def measure(function, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.mean(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("pages", nargs="*", type=Path)
+    parser.add_argument(
+        "--table", default="sched_all", help="Table id, or a regex if it starts with ^"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table_id = re.compile(args.table) if args.table.startswith("^") else args.table
+    pages = {path.name: path.read_bytes() for path in args.pages} or {
+        "synthetic": synthetic_page()
+    }
+
+    print(f"{'page':<30} {'backend':<22} {'mean ms':>10} {'peak KiB':>10}")
+    for name, content in pages.items():
+        candidates = {
+            backend: (lambda backend=backend: parse_table(content, table_id, backend))
+            for backend in available_backends()
+        }
+        candidates["html.parser (full tree)"] = lambda: full_tree_parse(
+            content, table_id
+        )
+        for backend, function in candidates.items():
+            mean, peak = measure(function, args.repeat)
+            print(f"{name:<30} {backend:<22} {mean * 1000:>10.1f} {peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
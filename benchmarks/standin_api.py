@@ -0,0 +1,209 @@
+"""
+Local stand-in for the livescore and odds APIs, for load testing ingestion.
+
+    python -m benchmarks.standin_api [--teams 36] [--matches 189] [--played 0.7]
+        [--latency-ms 50] [--error-rate 0.05] [--port 8900]
+
+Serves a synthetic season shaped like the real payloads on the endpoints the
+ingestion uses: livescore `scores/history.json` and `fixtures/list.json`
+(paginated, `from` filter on history) and the-odds-api `odds/`.
+Every request waits `--latency-ms` (+/- 50% jitter) and fails with a 503 at
+`--error-rate`. Point the app at it with:
+
+    LIVE_SCORES_API_HISTORY_ENDPOINT=http://localhost:8900/api-client/scores/history.json
+    LIVE_SCORES_API_FIXTURES_ENDPOINT=http://localhost:8900/api-client/fixtures/list.json
+    BETTING_ODDS_API_URL=http://localhost:8900/v4/sports/soccer_uefa_champs_league/odds/
+
+and HTTP_REPLAY_MODE=off, then run `python -m benchmarks.ingestion --steps api odds`
+against a scratch database.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+PAGE_SIZE = 30  # Items per page, as on livescore-api.com
+KICKOFF_TIMES = ("16:45", "19:00")
+MATCHES_PER_DAY = 8
+
+
+def synthetic_season(
+    teams: int, matches: int, played: float, start: date, seed: int = 0
+) -> tuple[list[dict], list[dict]]:
+    """
+    Builds `matches` games between `teams` teams, MATCHES_PER_DAY a day from
+    `start`. The first `played` fraction is finished. Returns (history, fixtures)
+    in the livescore payload formats.
+    """
+    rng = random.Random(seed)
+    names = [f"Synthetic FC {number:03d}" for number in range(1, teams + 1)]
+    pairings = itertools.cycle(itertools.permutations(names, 2))
+    finished = int(matches * played)
+
+    history, fixtures = [], []
+    for index in range(matches):
+        home, away = next(pairings)
+        day = start + timedelta(days=index // MATCHES_PER_DAY)
+        kickoff = KICKOFF_TIMES[index % len(KICKOFF_TIMES)]
+        odds = {
+            "pre": {
+                "1": round(rng.uniform(1.2, 6), 2),
+                "X": round(rng.uniform(2.8, 5), 2),
+                "2": round(rng.uniform(1.2, 6), 2),
+            }
+        }
+        if index >= finished:
+            fixtures.append(
+                {
+                    "id": index + 1,
+                    "home": {"name": home},
+                    "away": {"name": away},
+                    "date": day.isoformat(),
+                    "time": f"{kickoff}:00",
+                    "location": f"{home} Stadium",
+                    "odds": odds,
+                }
+            )
+            continue
+
+        home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 4)
+        full_time = (
+            "1" if home_goals > away_goals else "2" if away_goals > home_goals else "X"
+        )
+        history.append(
+            {
+                "id": index + 1,
+                "home_name": home,
+                "away_name": away,
+                "ft_score": f"{home_goals} - {away_goals}",
+                "ps_score": "",
+                "date": day.isoformat(),
+                "scheduled": kickoff,
+                "location": f"{home} Stadium",
+                "outcomes": {"full_time": full_time, "penalty_shootout": None},
+                "odds": odds,
+            }
+        )
+    return history, fixtures
+
+
+def odds_events(fixtures: list[dict], seed: int = 0) -> list[dict]:
+    """the-odds-api h2h events for the upcoming fixtures."""
+    rng = random.Random(seed)
+    events = []
+    for fixture in fixtures:
+        kickoff = datetime.fromisoformat(f"{fixture['date']}T{fixture['time']}")
+        home, away = fixture["home"]["name"], fixture["away"]["name"]
+        outcomes = [
+            {"name": home, "price": round(rng.uniform(1.2, 6), 2)},
+            {"name": away, "price": round(rng.uniform(1.2, 6), 2)},
+            {"name": "Draw", "price": round(rng.uniform(2.8, 5), 2)},
+        ]
+        events.append(
+            {
+                "id": f"synthetic-{fixture['id']}",
+                "sport_key": "soccer_uefa_champs_league",
+                "commence_time": f"{kickoff:%Y-%m-%dT%H:%M:%SZ}",
+                "home_team": home,
+                "away_team": away,
+                "bookmakers": [
+                    {
+                        "key": "unibet_eu",
+                        "markets": [{"key": "h2h", "outcomes": outcomes}],
+                    }
+                ],
+            }
+        )
+    return events
+
+
+def paginate(items: list[dict], page: int) -> tuple[list[dict], int]:
+    total_pages = max(1, -(-len(items) // PAGE_SIZE))
+    return items[(page - 1) * PAGE_SIZE : page * PAGE_SIZE], total_pages
+
+
+def create_app(
+    history: list[dict],
+    fixtures: list[dict],
+    latency_ms: float = 0,
+    error_rate: float = 0,
+) -> FastAPI:
+    app = FastAPI(title="Livescore / odds API stand-in")
+    events = odds_events(fixtures)
+    stats = {"requests": 0, "errors": 0}
+
+    @app.middleware("http")
+    async def simulate_network(request, call_next):
+        stats["requests"] += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms * random.uniform(0.5, 1.5) / 1000)
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=503, content={"detail": "Simulated outage"})
+        return await call_next(request)
+
+    @app.get("/api-client/scores/history.json")
+    def get_history(
+        page: int = Query(1, ge=1),
+        from_date: Optional[date] = Query(None, alias="from"),
+    ):
+        matches = [
+            match
+            for match in history
+            if from_date is None or date.fromisoformat(match["date"]) >= from_date
+        ]
+        items, total_pages = paginate(matches, page)
+        return {
+            "success": True,
+            "data": {"match": items, "total_pages": total_pages},
+        }
+
+    @app.get("/api-client/fixtures/list.json")
+    def get_fixtures(page: int = Query(1, ge=1)):
+        items, total_pages = paginate(fixtures, page)
+        return {
+            "success": True,
+            "data": {"fixtures": items, "total_pages": total_pages},
+        }
+
+    @app.get("/v4/sports/{sport}/odds/")
+    def get_odds(sport: str):
+        return events
+
+    @app.get("/stats")
+    def get_stats():
+        return stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--teams", type=int, default=36)
+    parser.add_argument("--matches", type=int, default=189)
+    parser.add_argument(
+        "--played", type=float, default=0.7, help="Fraction of finished matches"
+    )
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2024, 9, 17))
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    history, fixtures = synthetic_season(
+        args.teams, args.matches, args.played, args.start, args.seed
+    )
+    print(f"Serving {len(history)} finished matches and {len(fixtures)} fixtures")
+    app = create_app(history, fixtures, args.latency_ms, args.error_rate)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()